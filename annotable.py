@@ -4,15 +4,19 @@ See the README file.
 """
 
 import io
-from dataclasses import dataclass, field
+import itertools
+import sys
+from abc import ABC, abstractmethod
+from dataclasses import MISSING, dataclass, field, fields
 from pathlib import Path
-from typing import Any, Generator, Iterable
-from zipfile import ZipFile
+from typing import IO, Any, Callable, Generator, Iterable, Iterator, TypeVar, cast
+from zipfile import ZIP_DEFLATED, ZipFile
 
+import numpy as np
 import pandas as pd  # type: ignore
 
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     start: int
     end: int
@@ -20,20 +24,70 @@ class Token:
 
 
 class Annotable:
-    ...
+    __slots__ = ()
+
+    # Each element keeps a reference to the container it belongs to, so that
+    # adding an element empties the values cached (counts, chains) by this
+    # container and its ancestors only.  Changes made directly to the
+    # underlying lists (`_tokens`, `_mentions`, etc.) are not tracked: use the
+    # `add_*` methods.
+    _parent: "Annotable | None"
+
+    def __post_init__(self) -> None:
+        """Set the parent of the children given to the constructor."""
+
+    def _adopt(self, child: "Mention | _Cache") -> None:
+        child._parent = self
+        self._changed()
+
+    def _changed(self) -> None:
+        node: Annotable | None = self
+        while node is not None:
+            if isinstance(node, _Cache):
+                node._cache.clear()
+            node = node._parent
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The cache and the parent are not pickled (eg texts converted in
+        # worker processes): they are reset when unpickling.
+        return {
+            f.name: getattr(self, f.name) for f in fields(cast(Any, self)) if f.init
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for f in fields(cast(Any, self)):
+            if f.init:
+                value = state[f.name]
+            elif f.default_factory is not MISSING:
+                value = f.default_factory()
+            else:
+                value = f.default
+            setattr(self, f.name, value)
+        self.__post_init__()
 
 
-@dataclass
+@dataclass(slots=True)
 class Mention(Annotable):
     chain_name: str
     string: str
     _tokens: list[Token] = field(default_factory=list)
     features: dict[str, Any] = field(default_factory=dict)
+    _parent: Annotable | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "chain_name":
+            # chain names are repeated for every mention and used as dict keys
+            value = sys.intern(value)
+            # the chains cached by the containers depend on the chain names
+            if getattr(self, "_parent", None) is not None:
+                self._changed()
+        object.__setattr__(self, name, value)
 
     @property
-    def tokens(self) -> Generator[Token, None, None]:
-        for token in self._tokens:
-            yield token
+    def tokens(self) -> Iterator[Token]:
+        return iter(self._tokens)
 
     @property
     def token_count(self) -> int:
@@ -67,15 +121,17 @@ class Mention(Annotable):
         return self.end - self.start + 1
 
 
-@dataclass
+@dataclass(slots=True)
 class Chain:
     name: str
     _mentions: list[Mention] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        self.name = sys.intern(self.name)
+
     @property
-    def mentions(self) -> Generator[Mention, None, None]:
-        for mention in self._mentions:
-            yield mention
+    def mentions(self) -> Iterator[Mention]:
+        return iter(self._mentions)
 
     @property
     def mention_count(self) -> int:
@@ -85,37 +141,84 @@ class Chain:
         self._mentions.append(mention)
 
 
-def _iter_chains(mentions: Iterable[Mention]) -> Generator[Chain, None, None]:
+def _build_chains(mentions: Iterable[Mention]) -> dict[str, Chain]:
     chains: dict[str, Chain] = dict()
     for mention in mentions:
         if mention.chain_name not in chains:
             chains[mention.chain_name] = Chain(mention.chain_name)
         chains[mention.chain_name].add_mention(mention)
-    for chain in chains.values():
-        yield chain
+    return chains
 
 
-@dataclass
-class Sentence(Annotable):
+_T = TypeVar("_T")
+
+
+@dataclass(slots=True)
+class _Cache:
+    """Mixin caching values computed from the content of a container.
+
+    The cache is emptied when anything is added to the container or to one of
+    its descendants (see `Annotable._changed`).
+    """
+
+    _cache: dict[str, Any] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _parent: Annotable | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def _cached(self, key: str, compute: Callable[[], _T]) -> _T:
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return cast(_T, self._cache[key])
+
+
+@dataclass(slots=True)
+class _ChainCache(_Cache, ABC):
+    """Mixin caching the chains built from the `mentions` of a container."""
+
+    @property
+    @abstractmethod
+    def mentions(self) -> Iterator[Mention]:
+        ...
+
+    def _get_chains(self) -> dict[str, Chain]:
+        return self._cached("chains", lambda: _build_chains(self.mentions))
+
+    @property
+    def chains(self) -> Iterator[Chain]:
+        return iter(self._get_chains().values())
+
+    @property
+    def chain_count(self) -> int:
+        return len(self._get_chains())
+
+
+@dataclass(slots=True)
+class Sentence(Annotable, _ChainCache):
     _tokens: list[Token] = field(default_factory=list)
     _mentions: list[Mention] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        for mention in self._mentions:
+            mention._parent = self
+
     def add_mention(self, mention: Mention) -> None:
         self._mentions.append(mention)
+        self._adopt(mention)
 
     @property
-    def mentions(self) -> Generator[Mention, None, None]:
-        for mention in self._mentions:
-            yield mention
+    def mentions(self) -> Iterator[Mention]:
+        return iter(self._mentions)
 
     @property
     def mention_count(self) -> int:
         return len(self._mentions)
 
     @property
-    def tokens(self) -> Generator[Token, None, None]:
-        for token in self._tokens:
-            yield token
+    def tokens(self) -> Iterator[Token]:
+        return iter(self._tokens)
 
     @property
     def token_count(self) -> int:
@@ -123,16 +226,20 @@ class Sentence(Annotable):
 
     def add_token(self, token: Token) -> None:
         self._tokens.append(token)
+        self._changed()
 
 
-@dataclass
-class Paragraph(Annotable):
+@dataclass(slots=True)
+class Paragraph(Annotable, _ChainCache):
     _sentences: list[Sentence] = field(default_factory=list)
 
-    @property
-    def sentences(self) -> Generator[Sentence, None, None]:
+    def __post_init__(self) -> None:
         for sentence in self._sentences:
-            yield sentence
+            sentence._parent = self
+
+    @property
+    def sentences(self) -> Iterator[Sentence]:
+        return iter(self._sentences)
 
     @property
     def sentence_count(self) -> int:
@@ -140,45 +247,61 @@ class Paragraph(Annotable):
 
     def add_sentence(self, sentence: Sentence) -> None:
         self._sentences.append(sentence)
+        self._adopt(sentence)
 
     @property
-    def mentions(self) -> Generator[Mention, None, None]:
-        for sentence in self._sentences:
-            yield from sentence.mentions
+    def mentions(self) -> Iterator[Mention]:
+        return itertools.chain.from_iterable(
+            sentence.mentions for sentence in self._sentences
+        )
 
     @property
     def mention_count(self) -> int:
-        return sum(sentence.mention_count for sentence in self._sentences)
+        return self._cached(
+            "mention_count",
+            lambda: sum(sentence.mention_count for sentence in self._sentences),
+        )
 
     @property
-    def sentence_chains(self) -> Generator[Chain, None, None]:
-        for sentence in self.sentences:
-            yield from _iter_chains(sentence.mentions)
+    def sentence_chains(self) -> Iterator[Chain]:
+        return itertools.chain.from_iterable(
+            sentence.chains for sentence in self.sentences
+        )
 
     @property
     def sentence_chain_count(self) -> int:
-        return len(list(self.sentence_chains))
+        return self._cached(
+            "sentence_chain_count",
+            lambda: sum(sentence.chain_count for sentence in self.sentences),
+        )
 
     @property
-    def tokens(self) -> Generator[Token, None, None]:
-        for sentence in self._sentences:
-            yield from sentence.tokens
+    def tokens(self) -> Iterator[Token]:
+        return itertools.chain.from_iterable(
+            sentence.tokens for sentence in self._sentences
+        )
 
     @property
     def token_count(self) -> int:
-        return sum(sentence.token_count for sentence in self._sentences)
+        return self._cached(
+            "token_count",
+            lambda: sum(sentence.token_count for sentence in self._sentences),
+        )
 
 
-@dataclass
-class Text(Annotable):
+@dataclass(slots=True)
+class Text(Annotable, _ChainCache):
     name: str | None = None
     metadata: dict[str, Any] = field(default_factory=dict)
     _paragraphs: list[Paragraph] = field(default_factory=list)
 
-    @property
-    def paragraphs(self) -> Generator[Paragraph, None, None]:
+    def __post_init__(self) -> None:
         for paragraph in self._paragraphs:
-            yield paragraph
+            paragraph._parent = self
+
+    @property
+    def paragraphs(self) -> Iterator[Paragraph]:
+        return iter(self._paragraphs)
 
     @property
     def paragraph_count(self) -> int:
@@ -186,59 +309,72 @@ class Text(Annotable):
 
     def add_paragraph(self, paragraph: Paragraph) -> None:
         self._paragraphs.append(paragraph)
+        self._adopt(paragraph)
 
     @property
-    def sentences(self) -> Generator[Sentence, None, None]:
-        for paragraph in self._paragraphs:
-            yield from paragraph.sentences
+    def sentences(self) -> Iterator[Sentence]:
+        return itertools.chain.from_iterable(
+            paragraph.sentences for paragraph in self._paragraphs
+        )
 
     @property
     def sentence_count(self) -> int:
-        return sum(paragraph.sentence_count for paragraph in self._paragraphs)
+        return self._cached(
+            "sentence_count",
+            lambda: sum(paragraph.sentence_count for paragraph in self._paragraphs),
+        )
 
     @property
-    def mentions(self) -> Generator[Mention, None, None]:
-        for paragraph in self._paragraphs:
-            yield from paragraph.mentions
+    def mentions(self) -> Iterator[Mention]:
+        return itertools.chain.from_iterable(
+            paragraph.mentions for paragraph in self._paragraphs
+        )
 
     @property
     def mention_count(self) -> int:
-        return sum(paragraph.mention_count for paragraph in self._paragraphs)
-
-    @property
-    def chains(self) -> Generator[Chain, None, None]:
-        yield from _iter_chains(self.mentions)
-
-    @property
-    def chain_count(self) -> int:
-        return len(list(self.chains))
+        return self._cached(
+            "mention_count",
+            lambda: sum(paragraph.mention_count for paragraph in self._paragraphs),
+        )
 
     @property
-    def paragraph_chains(self) -> Generator[Chain, None, None]:
-        for paragraph in self.paragraphs:
-            yield from _iter_chains(paragraph.mentions)
+    def paragraph_chains(self) -> Iterator[Chain]:
+        return itertools.chain.from_iterable(
+            paragraph.chains for paragraph in self.paragraphs
+        )
 
     @property
     def paragraph_chain_count(self) -> int:
-        return len(list(self.paragraph_chains))
+        return self._cached(
+            "paragraph_chain_count",
+            lambda: sum(paragraph.chain_count for paragraph in self.paragraphs),
+        )
 
     @property
-    def sentence_chains(self) -> Generator[Chain, None, None]:
-        for sentence in self.sentences:
-            yield from _iter_chains(sentence.mentions)
+    def sentence_chains(self) -> Iterator[Chain]:
+        return itertools.chain.from_iterable(
+            sentence.chains for sentence in self.sentences
+        )
 
     @property
     def sentence_chain_count(self) -> int:
-        return len(list(self.sentence_chains))
+        return self._cached(
+            "sentence_chain_count",
+            lambda: sum(sentence.chain_count for sentence in self.sentences),
+        )
 
     @property
-    def tokens(self) -> Generator[Token, None, None]:
-        for paragraph in self._paragraphs:
-            yield from paragraph.tokens
+    def tokens(self) -> Iterator[Token]:
+        return itertools.chain.from_iterable(
+            paragraph.tokens for paragraph in self._paragraphs
+        )
 
     @property
     def token_count(self) -> int:
-        return sum(paragraph.token_count for paragraph in self._paragraphs)
+        return self._cached(
+            "token_count",
+            lambda: sum(paragraph.token_count for paragraph in self._paragraphs),
+        )
 
 
 @dataclass
@@ -257,14 +393,69 @@ class EmptyDataSet(Exception):
     pass
 
 
-@dataclass
-class Corpus(Annotable):
+def _index_in_group(group_ids: np.ndarray) -> np.ndarray:
+    """Return the position of each element in its group, `group_ids` being
+    sorted."""
+    count = len(group_ids)
+    starts = np.flatnonzero(np.r_[True, group_ids[1:] != group_ids[:-1]])
+    return np.arange(count) - np.repeat(starts, np.diff(np.r_[starts, count]))
+
+
+TOKEN_COLUMNS = (
+    "id",
+    "sentence_id",
+    "paragraph_id",
+    "text_id",
+    "text_name",
+    "start",
+    "end",
+    "length",
+    "string",
+    "index_of_paragraph_in_the_text",
+    "index_of_sentence_in_the_paragraph",
+    "index_of_sentence_in_the_text",
+    "index_of_token_in_the_sentence",
+    "index_of_token_in_the_paragraph",
+    "index_of_token_in_the_text",
+)
+
+# the features of the mentions are added after these columns
+TEXT_MENTION_COLUMNS = (
+    "id",
+    "chain_name",
+    "chain_id",
+    "sentence_id",
+    "paragraph_id",
+    "text_id",
+    "text_name",
+    "is_singleton",
+    "chain_size",
+    "start",
+    "end",
+    "length",
+    "string",
+    "token_count",
+    "index_of_mention_in_the_chain",
+    "index_of_paragraph_in_the_text",
+    "index_of_sentence_in_the_paragraph",
+    "index_of_sentence_in_the_text",
+    "index_of_mention_in_the_sentence",
+    "index_of_mention_in_the_paragraph",
+    "index_of_mention_in_the_text",
+)
+
+
+@dataclass(slots=True)
+class Corpus(Annotable, _Cache):
     _texts: list[Text] = field(default_factory=list)
 
-    @property
-    def texts(self) -> Generator[Text, None, None]:
+    def __post_init__(self) -> None:
         for text in self._texts:
-            yield text
+            text._parent = self
+
+    @property
+    def texts(self) -> Iterator[Text]:
+        return iter(self._texts)
 
     @property
     def text_count(self) -> int:
@@ -272,81 +463,95 @@ class Corpus(Annotable):
 
     def add_text(self, text: Text) -> None:
         self._texts.append(text)
+        self._adopt(text)
 
     @property
-    def paragraphs(self) -> Generator[Paragraph, None, None]:
-        for text in self._texts:
-            yield from text.paragraphs
+    def paragraphs(self) -> Iterator[Paragraph]:
+        return itertools.chain.from_iterable(text.paragraphs for text in self._texts)
 
     @property
     def paragraph_count(self) -> int:
-        return sum(text.paragraph_count for text in self._texts)
+        return self._cached(
+            "paragraph_count", lambda: sum(text.paragraph_count for text in self._texts)
+        )
 
     @property
-    def sentences(self) -> Generator[Sentence, None, None]:
-        for text in self._texts:
-            yield from text.sentences
+    def sentences(self) -> Iterator[Sentence]:
+        return itertools.chain.from_iterable(text.sentences for text in self._texts)
 
     @property
     def sentence_count(self) -> int:
-        return sum(text.sentence_count for text in self._texts)
+        return self._cached(
+            "sentence_count", lambda: sum(text.sentence_count for text in self._texts)
+        )
 
     @property
-    def mentions(self) -> Generator[Mention, None, None]:
-        for text in self._texts:
-            yield from text.mentions
+    def mentions(self) -> Iterator[Mention]:
+        return itertools.chain.from_iterable(text.mentions for text in self._texts)
 
     @property
     def mention_count(self) -> int:
-        return sum(text.mention_count for text in self._texts)
+        return self._cached(
+            "mention_count", lambda: sum(text.mention_count for text in self._texts)
+        )
 
     @property
-    def text_chains(self) -> Generator[Chain, None, None]:
-        for text in self._texts:
-            yield from _iter_chains(text.mentions)
+    def text_chains(self) -> Iterator[Chain]:
+        return itertools.chain.from_iterable(text.chains for text in self._texts)
 
     @property
     def text_chain_count(self) -> int:
-        return len(list(self.text_chains))
+        return self._cached(
+            "text_chain_count", lambda: sum(text.chain_count for text in self._texts)
+        )
 
     @property
-    def paragraph_chains(self) -> Generator[Chain, None, None]:
-        for paragraph in self.paragraphs:
-            yield from _iter_chains(paragraph.mentions)
+    def paragraph_chains(self) -> Iterator[Chain]:
+        return itertools.chain.from_iterable(
+            paragraph.chains for paragraph in self.paragraphs
+        )
 
     @property
     def paragraph_chain_count(self) -> int:
-        return len(list(self.paragraph_chains))
+        return self._cached(
+            "paragraph_chain_count",
+            lambda: sum(paragraph.chain_count for paragraph in self.paragraphs),
+        )
 
     @property
-    def sentence_chains(self) -> Generator[Chain, None, None]:
-        for sentence in self.sentences:
-            yield from _iter_chains(sentence.mentions)
+    def sentence_chains(self) -> Iterator[Chain]:
+        return itertools.chain.from_iterable(
+            sentence.chains for sentence in self.sentences
+        )
 
     @property
     def sentence_chain_count(self) -> int:
-        return len(list(self.sentence_chains))
+        return self._cached(
+            "sentence_chain_count",
+            lambda: sum(sentence.chain_count for sentence in self.sentences),
+        )
 
     @property
-    def tokens(self) -> Generator[Token, None, None]:
-        for text in self._texts:
-            yield from text.tokens
+    def tokens(self) -> Iterator[Token]:
+        return itertools.chain.from_iterable(text.tokens for text in self._texts)
 
     @property
     def token_count(self) -> int:
-        return sum(text.token_count for text in self._texts)
+        return self._cached(
+            "token_count", lambda: sum(text.token_count for text in self._texts)
+        )
 
     def iter_texts_as_dict(self) -> Generator[dict[str, Any], None, None]:
         for i, text in enumerate(self._texts):
-            data = dict(
-                id=i,
-                name=text.name,
-                token_count=text.token_count,
-                sentence_count=text.sentence_count,
-                paragraph_count=text.paragraph_count,
-                mention_count=text.mention_count,
-                chain_count=text.chain_count,
-            )
+            data = {
+                "id": i,
+                "name": text.name,
+                "token_count": text.token_count,
+                "sentence_count": text.sentence_count,
+                "paragraph_count": text.paragraph_count,
+                "mention_count": text.mention_count,
+                "chain_count": text.chain_count,
+            }
             for k, v in text.metadata.items():
                 data[k] = v
             yield data
@@ -354,17 +559,18 @@ class Corpus(Annotable):
     def iter_paragraphs_as_dict(self) -> Generator[dict[str, Any], None, None]:
         paragraph_index = 0
         for text_index, text in enumerate(self._texts):
+            text_name = text.name
             index_of_paragraph_in_the_text = 0
             for paragraph in text.paragraphs:
-                yield dict(
-                    id=paragraph_index,
-                    text_id=text_index,
-                    text_name=text.name,
-                    token_count=paragraph.token_count,
-                    sentence_count=paragraph.sentence_count,
-                    mention_count=paragraph.mention_count,
-                    index_of_paragraph_in_the_text=index_of_paragraph_in_the_text,
-                )
+                yield {
+                    "id": paragraph_index,
+                    "text_id": text_index,
+                    "text_name": text_name,
+                    "token_count": paragraph.token_count,
+                    "sentence_count": paragraph.sentence_count,
+                    "mention_count": paragraph.mention_count,
+                    "index_of_paragraph_in_the_text": index_of_paragraph_in_the_text,
+                }
                 paragraph_index += 1
                 index_of_paragraph_in_the_text += 1
 
@@ -372,22 +578,23 @@ class Corpus(Annotable):
         paragraph_index = 0
         sentence_index = 0
         for text_index, text in enumerate(self._texts):
+            text_name = text.name
             index_of_paragraph_in_the_text = 0
             index_of_sentence_in_the_text = 0
             for paragraph in text.paragraphs:
                 index_of_sentence_in_the_paragraph = 0
                 for sentence in paragraph.sentences:
-                    yield dict(
-                        id=sentence_index,
-                        paragraph_id=paragraph_index,
-                        text_id=text_index,
-                        text_name=text.name,
-                        token_count=sentence.token_count,
-                        mention_count=sentence.mention_count,
-                        index_of_paragraph_in_the_text=index_of_paragraph_in_the_text,
-                        index_of_sentence_in_the_paragraph=index_of_sentence_in_the_paragraph,
-                        index_of_sentence_in_the_text=index_of_sentence_in_the_text,
-                    )
+                    yield {
+                        "id": sentence_index,
+                        "paragraph_id": paragraph_index,
+                        "text_id": text_index,
+                        "text_name": text_name,
+                        "token_count": sentence.token_count,
+                        "mention_count": sentence.mention_count,
+                        "index_of_paragraph_in_the_text": index_of_paragraph_in_the_text,
+                        "index_of_sentence_in_the_paragraph": index_of_sentence_in_the_paragraph,
+                        "index_of_sentence_in_the_text": index_of_sentence_in_the_text,
+                    }
                     index_of_sentence_in_the_paragraph += 1
                     index_of_sentence_in_the_text += 1
                     sentence_index += 1
@@ -395,59 +602,98 @@ class Corpus(Annotable):
                 paragraph_index += 1
 
     def iter_tokens_as_dict(self) -> Generator[dict[str, Any], None, None]:
-        token_index = 0
-        paragraph_index = 0
-        sentence_index = 0
+        columns = self._get_token_columns()
+        for values in zip(*(columns[name].tolist() for name in TOKEN_COLUMNS)):
+            yield dict(zip(TOKEN_COLUMNS, values))
+
+    def _get_token_columns(self) -> dict[str, np.ndarray]:
+        # The columns of `TOKEN_COLUMNS`, used for both the dataframe and
+        # `iter_tokens_as_dict()`.  Only the sentences, paragraphs and texts
+        # are walked in Python: the values of the tokens are derived from them
+        # with numpy.
+        text_names: list[str | None] = []
+        paragraph_text_ids: list[int] = []
+        sentence_paragraph_ids: list[int] = []
+        sentence_token_counts: list[int] = []
         for text_index, text in enumerate(self._texts):
-            index_of_paragraph_in_the_text = 0
-            index_of_sentence_in_the_text = 0
-            index_of_token_in_the_text = 0
+            text_names.append(text.name)
             for paragraph in text.paragraphs:
-                index_of_sentence_in_the_paragraph = 0
-                index_of_token_in_the_paragraph = 0
+                paragraph_index = len(paragraph_text_ids)
+                paragraph_text_ids.append(text_index)
                 for sentence in paragraph.sentences:
-                    index_of_token_in_the_sentence = 0
-                    for token in sentence.tokens:
-                        yield dict(
-                            id=token_index,
-                            sentence_id=sentence_index,
-                            paragraph_id=paragraph_index,
-                            text_id=text_index,
-                            text_name=text.name,
-                            start=token.start,
-                            end=token.end,
-                            length=token.end - token.start + 1,
-                            string=token.value,
-                            index_of_paragraph_in_the_text=index_of_paragraph_in_the_text,
-                            index_of_sentence_in_the_paragraph=index_of_sentence_in_the_paragraph,
-                            index_of_sentence_in_the_text=index_of_sentence_in_the_text,
-                            index_of_token_in_the_sentence=index_of_token_in_the_sentence,
-                            index_of_token_in_the_paragraph=index_of_token_in_the_paragraph,
-                            index_of_token_in_the_text=index_of_token_in_the_text,
-                        )
-                        index_of_token_in_the_sentence += 1
-                        index_of_token_in_the_paragraph += 1
-                        index_of_token_in_the_text += 1
-                        token_index += 1
-                    index_of_sentence_in_the_paragraph += 1
-                    index_of_sentence_in_the_text += 1
-                    sentence_index += 1
-                index_of_paragraph_in_the_text += 1
-                paragraph_index += 1
+                    sentence_paragraph_ids.append(paragraph_index)
+                    sentence_token_counts.append(sentence.token_count)
+
+        token_counts = np.array(sentence_token_counts, dtype=np.int64)
+        paragraph_text_id = np.array(paragraph_text_ids, dtype=np.int64)
+        index_of_paragraph_in_the_text = _index_in_group(paragraph_text_id)
+        sentence_paragraph_id = np.array(sentence_paragraph_ids, dtype=np.int64)
+        sentence_text_id = paragraph_text_id[sentence_paragraph_id]
+
+        def repeat(sentence_values: np.ndarray) -> np.ndarray:
+            return np.repeat(sentence_values, token_counts)
+
+        sentence_id = repeat(np.arange(len(token_counts), dtype=np.int64))
+        paragraph_id = repeat(sentence_paragraph_id)
+        text_id = repeat(sentence_text_id)
+        tokens = list(self.tokens)
+        starts = np.array([token.start for token in tokens], dtype=np.int64)
+        ends = np.array([token.end for token in tokens], dtype=np.int64)
+        return dict(
+            id=np.arange(len(starts), dtype=np.int64),
+            sentence_id=sentence_id,
+            paragraph_id=paragraph_id,
+            text_id=text_id,
+            text_name=np.array(text_names, dtype=object)[text_id],
+            start=starts,
+            end=ends,
+            length=ends - starts + 1,
+            string=np.array([token.value for token in tokens], dtype=object),
+            index_of_paragraph_in_the_text=repeat(
+                index_of_paragraph_in_the_text[sentence_paragraph_id]
+            ),
+            index_of_sentence_in_the_paragraph=repeat(
+                _index_in_group(sentence_paragraph_id)
+            ),
+            index_of_sentence_in_the_text=repeat(_index_in_group(sentence_text_id)),
+            index_of_token_in_the_sentence=_index_in_group(sentence_id),
+            index_of_token_in_the_paragraph=_index_in_group(paragraph_id),
+            index_of_token_in_the_text=_index_in_group(text_id),
+        )
 
     def iter_text_mentions_as_dict(self) -> Generator[dict[str, Any], None, None]:
-        mention_indices_in_texts: dict[int, int] = dict()
-        mention_indices_in_paragraphs: dict[int, int] = dict()
-        mention_indices_in_sentences: dict[int, int] = dict()
-        paragraph_indices_in_text: dict[int, int] = dict()
-        sentence_indices_in_text: dict[int, int] = dict()
-        sentence_indices_in_paragraph: dict[int, int] = dict()
-        paragraph_indices: dict[int, int] = dict()
-        sentence_indices: dict[int, int] = dict()
+        for values, features in self._iter_text_mentions_as_tuples():
+            data = dict(zip(TEXT_MENTION_COLUMNS, values))
+            for k, v in features.items():
+                data[k] = v
+            yield data
 
+    def _iter_text_mentions_as_tuples(
+        self,
+    ) -> Generator[tuple[tuple[Any, ...], dict[str, Any]], None, None]:
+        # Rows are ordered chain by chain, but are built in a single walk of
+        # the text in reading order: the (cached) chains of the text give the
+        # row where each chain starts, so each mention is put directly at its
+        # final position.
+        mention_index = 0
+        chain_index = 0
         paragraph_index = 0
         sentence_index = 0
-        for text in self._texts:
+        for text_index, text in enumerate(self._texts):
+            text_name = text.name
+            chain_positions: dict[str, tuple[int, int, int]] = dict()
+            row_count = 0
+            for chain in text.chains:
+                chain_positions[chain.name] = (
+                    chain_index,
+                    row_count,
+                    chain.mention_count,
+                )
+                chain_index += 1
+                row_count += chain.mention_count
+            rows: list[tuple[tuple[Any, ...], dict[str, Any]]] = [((), {})] * row_count
+            mention_indices_in_chains: dict[str, int] = dict()
+
             index_of_mention_in_text = 0
             index_of_paragraph_in_the_text = 0
             index_of_sentence_in_the_text = 0
@@ -457,24 +703,44 @@ class Corpus(Annotable):
                 for sentence in paragraph.sentences:
                     index_of_mention_in_sentence = 0
                     for mention in sentence.mentions:
-                        mention_indices_in_sentences[
-                            id(mention)
-                        ] = index_of_mention_in_sentence
-                        mention_indices_in_paragraphs[
-                            id(mention)
-                        ] = index_of_mention_in_paragraph
-                        mention_indices_in_texts[id(mention)] = index_of_mention_in_text
-                        sentence_indices_in_paragraph[
-                            id(mention)
-                        ] = index_of_sentence_in_the_paragraph
-                        sentence_indices_in_text[
-                            id(mention)
-                        ] = index_of_sentence_in_the_text
-                        paragraph_indices_in_text[
-                            id(mention)
-                        ] = index_of_paragraph_in_the_text
-                        sentence_indices[id(mention)] = sentence_index
-                        paragraph_indices[id(mention)] = paragraph_index
+                        chain_id, first_row, chain_size = chain_positions[
+                            mention.chain_name
+                        ]
+                        index_of_mention_in_the_chain = mention_indices_in_chains.get(
+                            mention.chain_name, 0
+                        )
+                        mention_indices_in_chains[mention.chain_name] = (
+                            index_of_mention_in_the_chain + 1
+                        )
+                        row = first_row + index_of_mention_in_the_chain
+                        start = mention.start
+                        end = mention.end
+                        rows[row] = (
+                            (
+                                mention_index + row,
+                                mention.chain_name,
+                                chain_id,
+                                sentence_index,
+                                paragraph_index,
+                                text_index,
+                                text_name,
+                                chain_size == 1,
+                                chain_size,
+                                start,
+                                end,
+                                end - start + 1,
+                                mention.string,
+                                mention.token_count,
+                                index_of_mention_in_the_chain,
+                                index_of_paragraph_in_the_text,
+                                index_of_sentence_in_the_paragraph,
+                                index_of_sentence_in_the_text,
+                                index_of_mention_in_sentence,
+                                index_of_mention_in_paragraph,
+                                index_of_mention_in_text,
+                            ),
+                            mention.features,
+                        )
                         index_of_mention_in_sentence += 1
                         index_of_mention_in_paragraph += 1
                         index_of_mention_in_text += 1
@@ -484,65 +750,23 @@ class Corpus(Annotable):
                 index_of_paragraph_in_the_text += 1
                 paragraph_index += 1
 
-        mention_index = 0
-        chain_id = 0
-        for text_index, text in enumerate(self._texts):
-            for chain in text.chains:
-                for index_of_mention_in_the_chain, mention in enumerate(chain.mentions):
-                    data = dict(
-                        id=mention_index,
-                        chain_name=chain.name,
-                        chain_id=chain_id,
-                        sentence_id=sentence_indices[id(mention)],
-                        paragraph_id=paragraph_indices[id(mention)],
-                        text_id=text_index,
-                        text_name=text.name,
-                        is_singleton=chain.mention_count == 1,
-                        chain_size=chain.mention_count,
-                        start=mention.start,
-                        end=mention.end,
-                        length=mention.end - mention.start + 1,
-                        string=mention.string,
-                        token_count=mention.token_count,
-                        index_of_mention_in_the_chain=index_of_mention_in_the_chain,
-                        index_of_paragraph_in_the_text=paragraph_indices_in_text[
-                            id(mention)
-                        ],
-                        index_of_sentence_in_the_paragraph=sentence_indices_in_paragraph[
-                            id(mention)
-                        ],
-                        index_of_sentence_in_the_text=sentence_indices_in_text[
-                            id(mention)
-                        ],
-                        index_of_mention_in_the_sentence=mention_indices_in_sentences[
-                            id(mention)
-                        ],
-                        index_of_mention_in_the_paragraph=mention_indices_in_paragraphs[
-                            id(mention)
-                        ],
-                        index_of_mention_in_the_text=mention_indices_in_texts[
-                            id(mention)
-                        ],
-                    )
-                    for k, v in mention.features.items():
-                        data[k] = v
-                    yield data
-                    mention_index += 1
-                chain_id += 1
+            yield from rows
+            mention_index += row_count
 
     def iter_text_chains_as_dict(self) -> Generator[dict[str, Any], None, None]:
         chain_index = 0
         for text_index, text in enumerate(self._texts):
+            text_name = text.name
             index_of_chain_in_the_text = 0
             for chain in text.chains:
-                yield dict(
-                    id=chain_index,
-                    text_id=text_index,
-                    text_name=text.name,
-                    name=chain.name,
-                    size=chain.mention_count,
-                    index_of_chain_in_the_text=index_of_chain_in_the_text,
-                )
+                yield {
+                    "id": chain_index,
+                    "text_id": text_index,
+                    "text_name": text_name,
+                    "name": chain.name,
+                    "size": chain.mention_count,
+                    "index_of_chain_in_the_text": index_of_chain_in_the_text,
+                }
                 index_of_chain_in_the_text += 1
                 chain_index += 1
 
@@ -553,21 +777,22 @@ class Corpus(Annotable):
         relation_index = 0
         mention_index = 0
         for text_index, text in enumerate(self._texts):
+            text_name = text.name
             for chain in text.chains:
                 first_mention_index: int | None = None
                 for i, mention in enumerate(chain.mentions):
                     if i == 0:
                         first_mention_index = mention_index
                     else:
-                        yield dict(
-                            id=relation_index,
-                            chain_id=chain_index,
-                            chain_name=chain.name,
-                            text_id=text_index,
-                            text_name=text.name,
-                            m1_id=first_mention_index,
-                            m2_id=mention_index,
-                        )
+                        yield {
+                            "id": relation_index,
+                            "chain_id": chain_index,
+                            "chain_name": chain.name,
+                            "text_id": text_index,
+                            "text_name": text_name,
+                            "m1_id": first_mention_index,
+                            "m2_id": mention_index,
+                        }
                         relation_index += 1
                     mention_index += 1
                 chain_index += 1
@@ -579,44 +804,65 @@ class Corpus(Annotable):
         relation_index = 0
         mention_index = 0
         for text_index, text in enumerate(self._texts):
+            text_name = text.name
             for chain in text.chains:
                 for i, mention in enumerate(chain.mentions):
                     if i == 0:
                         pass
                     else:
-                        yield dict(
-                            id=relation_index,
-                            chain_id=chain_index,
-                            chain_name=chain.name,
-                            text_id=text_index,
-                            text_name=text.name,
-                            m1_id=mention_index - 1,
-                            m2_id=mention_index,
-                        )
+                        yield {
+                            "id": relation_index,
+                            "chain_id": chain_index,
+                            "chain_name": chain.name,
+                            "text_id": text_index,
+                            "text_name": text_name,
+                            "m1_id": mention_index - 1,
+                            "m2_id": mention_index,
+                        }
                         relation_index += 1
                     mention_index += 1
                 chain_index += 1
 
     def get_dataframes(self) -> DataFrameSet:
-        def get_df(data: Iterable[dict[str, Any]], name: str) -> pd.DataFrame:
-            try:
-                index, dicts = zip(
-                    *map(
-                        lambda d: (d["id"], {k: v for k, v in d.items() if k != "id"}),
-                        data,
-                    )
-                )
-            except ValueError:
+        def set_index(df: pd.DataFrame, name: str) -> pd.DataFrame:
+            if df.empty:
                 raise EmptyDataSet(f"Empty data set: '{name}'")
-            else:
-                return pd.DataFrame(data=dicts, index=index)
+            df = df.set_index("id")
+            df.index.name = None
+            return df
+
+        def get_df(data: Iterable[dict[str, Any]], name: str) -> pd.DataFrame:
+            return set_index(pd.DataFrame.from_records(list(data)), name)
+
+        def get_df_from_tuples(
+            data: Iterable[tuple[Any, ...]], columns: tuple[str, ...], name: str
+        ) -> pd.DataFrame:
+            return set_index(
+                pd.DataFrame.from_records(list(data), columns=columns), name
+            )
+
+        def get_text_mentions_df() -> pd.DataFrame:
+            rows: list[tuple[Any, ...]] = []
+            features: list[dict[str, Any]] = []
+            for values, mention_features in self._iter_text_mentions_as_tuples():
+                rows.append(values)
+                features.append(mention_features)
+            df = get_df_from_tuples(rows, TEXT_MENTION_COLUMNS, "text_mentions")
+            features_df = pd.DataFrame(features, index=df.index)
+            new_columns = [k for k in features_df.columns if k not in df.columns]
+            for k in features_df.columns:
+                if k not in new_columns:
+                    # a feature overrides the column, but only for the mentions
+                    # that have it
+                    df[k] = [f[k] if k in f else v for f, v in zip(features, df[k])]
+            return pd.concat([df, features_df[new_columns]], axis=1)
 
         return DataFrameSet(
             texts=get_df(self.iter_texts_as_dict(), "texts"),
             paragraphs=get_df(self.iter_paragraphs_as_dict(), "paragraphs"),
             sentences=get_df(self.iter_sentences_as_dict(), "sentences"),
-            tokens=get_df(self.iter_tokens_as_dict(), "tokens"),
-            text_mentions=get_df(self.iter_text_mentions_as_dict(), "text_mentions"),
+            tokens=set_index(pd.DataFrame(self._get_token_columns()), "tokens"),
+            text_mentions=get_text_mentions_df(),
             text_chains=get_df(self.iter_text_chains_as_dict(), "text_chains"),
             text_to_first_relations=get_df(
                 self.iter_text_to_first_relations_as_dict(), "text_to_first_relations"
@@ -627,26 +873,22 @@ class Corpus(Annotable):
             ),
         )
 
-    def _create_csv_as_zip(self) -> io.BytesIO:
+    def _write_csv_to_zip(self, file: Path | IO[bytes]) -> None:
         dfs = self.get_dataframes()
 
-        buf = io.BytesIO()
-        zf = ZipFile(buf, "w")
-        zf.writestr("texts", dfs.texts.to_csv())
-        zf.writestr("paragraphs", dfs.paragraphs.to_csv())
-        zf.writestr("sentences", dfs.sentences.to_csv())
-        zf.writestr("tokens", dfs.tokens.to_csv())
-        zf.writestr("text_mentions", dfs.text_mentions.to_csv())
-        zf.writestr("text_chains", dfs.text_chains.to_csv())
-        zf.writestr("text_to_first_relations", dfs.text_to_first_relations.to_csv())
-        zf.writestr(
-            "text_consecutive_relations", dfs.text_consecutive_relations.to_csv()
-        )
-        zf.close()
+        with ZipFile(file, "w", compression=ZIP_DEFLATED) as zf:
+            # the csv are written directly in the archive: they are never
+            # held in memory as a whole string
+            for df_field in fields(dfs):
+                with zf.open(df_field.name, "w", force_zip64=True) as fh:
+                    with io.TextIOWrapper(fh, encoding="utf-8", newline="") as text_fh:
+                        getattr(dfs, df_field.name).to_csv(text_fh)
 
+    def _create_csv_as_zip(self) -> io.BytesIO:
+        buf = io.BytesIO()
+        self._write_csv_to_zip(buf)
         buf.seek(0)
         return buf
 
     def save_csv_as_zip(self, file: Path) -> None:
-        buf = self._create_csv_as_zip()
-        file.write_bytes(buf.read())
+        self._write_csv_to_zip(file)
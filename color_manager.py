@@ -4,7 +4,9 @@ This module defines a ColorManager.
 
 # 2020 Bruno Oberle, MPL 2.0, see the LICENSE file.
 
-__version__ = '1.1.0'
+import itertools
+
+__version__ = '1.2.0'
 
 
 class ColorManager:
@@ -63,9 +65,9 @@ class ColorManager:
 
     def __len__(self):
         """Return the number of available colors."""
-        hue = 360 // self.hue_step + 1
-        saturation = 100 // self.saturation_step
-        lightness = 70 // self.lightness_step # because ]10;80]
+        hue = len(range(0, 361, self.hue_step))
+        saturation = len(range(100, -1, -self.saturation_step))
+        lightness = len(range(80, 9, -self.lightness_step)) # because [10;80]
         return hue * saturation * lightness
 
     def reset_iterator(self):
@@ -76,6 +78,19 @@ class ColorManager:
         """Return the next color."""
         return next(self._iter)
 
+    def get_colors(self):
+        """Return the list of all the colors, in the order of the iterator.
+
+        The colors are formatted once, when the iterator is (re)set, and then
+        repeated from this list.
+        """
+        return [
+            f"hsl({h}, {s}%, {l}%)"
+            for s in range(100, -1, -self.saturation_step)
+            for l in range(80, 9, -self.lightness_step)
+            for h in range(0, 361, self.hue_step)
+        ]
+
     def iter_color(self):
         """Generator that goes through all the colors.
 
@@ -84,11 +99,9 @@ class ColorManager:
         When there is no more color, yield the `gray` instance attribute.
         Never raises StopIteration.
         """
+        colors = self.get_colors()
         while True:
-            for s in range(100, -1, -self.saturation_step):
-                for l in range(80, 9, -self.lightness_step):
-                    for h in range (0, 361, self.hue_step):
-                        yield "hsl(%d, %d%%, %d%%)" % (h, s, l)
+            yield from colors
             if not self.repeat:
                 while True:
                     yield self.gray
@@ -101,7 +114,7 @@ class CommonColorManager:
 
     gray = "gray"
 
-    colors = [
+    colors = (
         "red",
         "maroon",
         "yellow",
@@ -114,13 +127,13 @@ class CommonColorManager:
         "navy",
         "fuchsia",
         "purple",
-    ]
+    )
 
     def __init__(self, remove_yellow=True, repeat=True):
-        self.repeat = True
-        self.colors = self.__class__.colors.copy()
+        self.repeat = repeat
+        self.colors = self.__class__.colors
         if remove_yellow:
-            self.colors.remove("yellow")
+            self.colors = tuple(c for c in self.colors if c != "yellow")
         self.reset_iterator()
 
     def __len__(self):
@@ -137,11 +150,10 @@ class CommonColorManager:
 
     def iter_color(self):
         """Generator that goes through all the colors."""
+        if self.repeat:
+            yield from itertools.cycle(self.colors)
+        else:
+            yield from self.colors
         while True:
-            for color in self.colors:
-                yield color
-            if not self.repeat:
-                while True:
-                    yield self.__class__.gray
-
+            yield self.__class__.gray
 
@@ -59,9 +59,28 @@ running this script if you want to transform them.
 import json
 import os
 import argparse
+from itertools import groupby
+from operator import itemgetter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 import conll_transform
 
+# size (in bytes) of the serialized documents kept before writing them
+FLUSH_SIZE = 4<<20
+
+def dumps(obj):
+    """Serialize `obj` as compact utf-8 json bytes, with `orjson` if it is
+    installed, with the standard `json` module otherwise (same output).
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')) \
+        .encode('utf-8')
+
 
 def conll2jsonlines(
         infpath, outfpath,
@@ -69,15 +88,21 @@ def conll2jsonlines(
         ignore_double_indices=None,
         skip_empty_documents=False, skip_singletons=False):
 
-    docs = conll_transform.read_files(
+    docs = conll_transform.iter_file(
         infpath,
         sep=sep,
         ignore_double_indices=ignore_double_indices,
+        # tokens and speakers are repeated many times in a document
+        intern_cols=True,
     )
 
-    with open(outfpath, 'w') as fh:
+    with open(outfpath, 'wb', buffering=1<<20) as fh:
 
-        for doc_key, doc in docs.items():
+        # serialized documents waiting to be written
+        buf = []
+        buf_size = 0
+
+        for doc_key, doc in docs:
 
             print("Doing %s" % doc_key)
 
@@ -99,34 +124,38 @@ def conll2jsonlines(
 
             tokens = [t for sent in doc for t in sent]
 
-            sentences = [
-                [token[token_col] for token in sent] for sent in doc
-            ]
+            get_token = itemgetter(token_col)
+            sentences = [list(map(get_token, sent)) for sent in doc]
 
             if par_col:
+                # group consecutive sentences with the same paragraph id
+                par_ids = [int(sent[0][par_col]) for sent in doc]
+                sizes = map(len, doc)
                 start = 0
-                length = 0
-                current = -1
                 paragraphs = []
-                for sent in doc:
-                    length += len(sent)
-                    if int(sent[0][par_col]) != current:
-                        current = int(sent[0][par_col])
-                        paragraphs.append([start, start+length-1])
-                        start += length
-                        length = 0
+                groups = groupby(zip(par_ids, sizes), key=itemgetter(0))
+                for _, group in groups:
+                    par_size = sum(map(itemgetter(1), group))
+                    paragraphs.append([start, start+par_size-1])
+                    start += par_size
             else:
                 #paragraphs = [[0, len(tokens)]]
                 paragraphs = None
 
             if speaker_col.isdigit():
-                speakers = [
-                    [token[int(speaker_col)] for token in sent] for sent in doc
-                ]
+                get_speaker = itemgetter(int(speaker_col))
+                speakers = [list(map(get_speaker, sent)) for sent in doc]
             else:
-                speakers = [
-                    [speaker_col for token in sent] for sent in sentences
-                ]
+                # sentences of the same length share the same list (it is
+                # only serialized, never modified)
+                cache = dict()
+                speakers = []
+                for sent in sentences:
+                    k = len(sent)
+                    lst = cache.get(k)
+                    if lst is None:
+                        lst = cache[k] = [speaker_col] * k
+                    speakers.append(lst)
 
 
             dic = dict(
@@ -137,7 +166,16 @@ def conll2jsonlines(
             )
             if paragraphs is not None:
                 dic['paragraphs'] = paragraphs
-            fh.write(json.dumps(dic) + "\n")
+            data = dumps(dic)
+            buf.append(data)
+            buf.append(b"\n")
+            buf_size += len(data) + 1
+            if buf_size > FLUSH_SIZE:
+                fh.write(b"".join(buf))
+                buf.clear()
+                buf_size = 0
+
+        fh.write(b"".join(buf))
 
 
 
@@ -26,27 +26,33 @@ Use the `--ignore-double-indices` if you want to ignore French amalgams
 import re
 import argparse
 import os
+from operator import itemgetter
 
 import conll_transform
 from standoff2inline import Standoff2Inline
 
 def convert(doc, doc_key, dpath, token_col):
 
-    res = ""
+    parts = []
+    get_token = itemgetter(token_col)
+    get_coref = itemgetter(-1)
+    inliner = Standoff2Inline(kind='sacr')
 
     for sent in doc:
-        inliner = Standoff2Inline(kind='sacr')
-        mentions = conll_transform.compute_mentions([t[-1] for t in sent])
+        inliner.clear()
+        mentions = conll_transform.compute_mentions(list(map(get_coref, sent)))
         for (start, stop), chain in mentions:
-            inliner.add((start, (f"C{chain}", dict())), stop-1)
-        res += inliner.apply(tokens=[t[token_col] for t in sent])
-        res += "\n\n"
+            inliner.add_start_end((start, (f"C{chain}", dict())), (stop-1, None))
+        parts.append(inliner.apply(tokens=list(map(get_token, sent))))
+        parts.append("\n\n")
+    res = "".join(parts)
 
     if not isinstance(doc_key, str):
         doc_key = "_".join(str(x) for x in doc_key)
     fname = re.sub(r'[^-\w.]', r'_', doc_key)
     fpath = os.path.join(dpath, fname)
-    open(fpath, 'w').write(res)
+    with open(fpath, 'w', buffering=1<<20) as fh:
+        fh.write(res)
 
 
 def parse_args():
@@ -82,6 +88,8 @@ def main():
         args.infpath,
         sep="\t" if args.tab_sep else None,
         ignore_double_indices=args.ignore_double_indices,
+        # all the documents are kept in memory
+        intern_cols=True,
     )
     for doc_key, doc in docs.items():
         print(f"Doing {doc_key}")
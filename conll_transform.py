@@ -4,7 +4,13 @@ informations from a conll files (last column).
 """
 
 import re
-from collections import OrderedDict
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict, defaultdict
+from functools import partial
+from itertools import accumulate, zip_longest
+from operator import itemgetter
+from sys import intern
 from warnings import warn
 
 START_DOC_PATTERN = re.compile(
@@ -19,7 +25,7 @@ CONLL_MENTION_PATTERN = re.compile(
 
 
 def read_files(*fpaths, sep=None, ignore_double_indices=False,
-        ignore_comments=True):
+        ignore_comments=True, intern_cols=False):
     """Read one or several conll files and return a dictionary of documents.
 
     It just calls `read_file()` for each path.
@@ -31,13 +37,14 @@ def read_files(*fpaths, sep=None, ignore_double_indices=False,
                 read_file(fpath,
                 sep=sep,
                 ignore_double_indices=ignore_double_indices,
-                ignore_comments=ignore_comments)
+                ignore_comments=ignore_comments,
+                intern_cols=intern_cols)
             )
     return docs
 
 
 def read_file(fpath, sep=None, ignore_double_indices=False,
-        ignore_comments=True):
+        ignore_comments=True, intern_cols=False):
     """Read a conll file and return dictionary of documents.
 
     Dictionary format:
@@ -64,32 +71,68 @@ def read_file(fpath, sep=None, ignore_double_indices=False,
                 ...
             ],
         ]
+
+    If `intern_cols`, cells are interned (see `sys.intern()`), which saves
+    memory for large files, since most cells (POS, "*", "-", etc.) are
+    repeated many times.
     """
 
-    docs = OrderedDict()
-    for i, line in enumerate(open(fpath), start=1):
-        m = START_DOC_PATTERN.fullmatch(line)
-        # new document
-        if m:
-            key = m.group(1)
-            sentences = [] # [ [ tokens... ], [ tokens... ] ]
-            new_sentence = True
-        elif line == END_DOC_STRING:
-            docs[key] = sentences
-        elif line == "\n":
-            new_sentence = True
-        elif line.startswith("#") and ignore_comments:
-            pass
+    return OrderedDict(iter_file(fpath,
+        sep=sep,
+        ignore_double_indices=ignore_double_indices,
+        ignore_comments=ignore_comments,
+        intern_cols=intern_cols))
+
+
+def iter_file(fpath, sep=None, ignore_double_indices=False,
+        ignore_comments=True, intern_cols=False):
+    """Same as `read_file()`, but yield the `(name, sentences)` pairs one
+    document at a time, so that only one document is kept in memory.
+    """
+
+    with open(fpath, buffering=1<<20) as fh:
+        lines = None
+        for line in fh:
+            if lines is None:
+                m = START_DOC_PATTERN.fullmatch(line)
+                if m:
+                    key = m.group(1)
+                    lines = []
+            elif line == END_DOC_STRING:
+                yield key, _read_sentences("".join(lines), sep,
+                    ignore_double_indices, ignore_comments, intern_cols)
+                lines = None
+            else:
+                lines.append(line)
+
+
+def _read_sentences(body, sep, ignore_double_indices, ignore_comments,
+        intern_cols):
+    """Split the `body` of a document (what is between the `#begin document`
+    and `#end document` lines) into sentences, tokens and cells.
+    """
+
+    check_indices = isinstance(ignore_double_indices, int) \
+        and ignore_double_indices >= 0
+    sentences = [] # [ [ tokens... ], [ tokens... ] ]
+    for chunk in body.split("\n\n"):
+        # empty strings come from consecutive blank lines
+        if ignore_comments:
+            lines = [line for line in chunk.split("\n")
+                if line and line[0] != "#"]
         else:
-            if new_sentence:
-                sentences.append([])
-            new_sentence = False
-            split = line[:-1].split(sep)
-            if isinstance(ignore_double_indices, int) and \
-                    ignore_double_indices >= 0 and "-" in split[ignore_double_indices]:
-                continue
-            sentences[-1].append(split)
-    return docs
+            lines = list(filter(None, chunk.split("\n")))
+        if not lines:
+            continue
+        if intern_cols:
+            sentence = [list(map(intern, line.split(sep))) for line in lines]
+        else:
+            sentence = [line.split(sep) for line in lines]
+        if check_indices:
+            sentence = [tok for tok in sentence
+                if "-" not in tok[ignore_double_indices]]
+        sentences.append(sentence)
+    return sentences
 
 
 def write_file(fpath, docs, *, align_right=True, sep=None):
@@ -100,34 +143,51 @@ def write_file(fpath, docs, *, align_right=True, sep=None):
     * align_right: bool (def True) whether to align col to the right
     """
 
-    fh = open(fpath, 'w')
-    for key, sents in docs.items():
-        fh.write(f'#begin document {key}\n')
-        for s, sent in enumerate(sents):
-            if s > 0:
-                fh.write("\n")
-            if sep is None:
-                # compute max lengths
-                lengths = None
-                for tok in sent:
-                    if lengths is None:
-                        lengths = [0]*len(tok)
-                    for c, col in enumerate(tok):
-                        lengths[c] = max(lengths[c], len(col))
-                for tok in sent:
-                    for c, col in enumerate(tok):
-                        if align_right:
-                            extra = 0 if c == 0 else 3
-                            fmt = "%% %ds" % (lengths[c] + extra)
-                            fh.write(fmt % col)
-                        else:
-                            fh.write(col)
+    with open(fpath, 'w', buffering=1<<20) as fh:
+        for key, sents in docs.items():
+            fh.write(f'#begin document {key}\n')
+            for s, sent in enumerate(sents):
+                if s > 0:
                     fh.write("\n")
-            else:
-                for tok in sent:
-                    fh.write("\t".join(tok) + "\n")
-        fh.write('#end document\n\n')
-    fh.close()
+                if sep is None:
+                    if align_right:
+                        # compute max lengths
+                        lengths = [max(map(len, col))
+                            for col in zip_longest(*sent, fillvalue="")]
+                        fmts = ["%%%ds" % (length + (0 if c == 0 else 3))
+                            for c, length in enumerate(lengths)]
+                        lines = ["".join([fmt % col
+                            for fmt, col in zip(fmts, tok)]) for tok in sent]
+                    else:
+                        lines = ["".join(tok) for tok in sent]
+                    fh.write("".join([line + "\n" for line in lines]))
+                else:
+                    fh.writelines("\t".join(tok) + "\n" for tok in sent)
+            fh.write('#end document\n\n')
+
+
+
+# cell -> ((kind, chain), ...), see `_parse_cell()`
+_MENTION_CACHE = dict()
+_MENTION_CACHE_SIZE = 100000
+
+def _parse_cell(cell):
+    """Return the mention boundaries of a cell of the coreference column as a
+    tuple of `(kind, chain)`, where `kind` is one of `mono`, `start` and `end`.
+
+    Results are memoized, since the same few cells are repeated over and over.
+    """
+
+    parsed = _MENTION_CACHE.get(cell)
+    if parsed is None:
+        parsed = tuple(
+            (m.lastgroup, int(m.group(m.lastgroup)))
+            for m in CONLL_MENTION_PATTERN.finditer(cell)
+        )
+        if len(_MENTION_CACHE) >= _MENTION_CACHE_SIZE:
+            _MENTION_CACHE.clear()
+        _MENTION_CACHE[cell] = parsed
+    return parsed
 
 
 
@@ -151,22 +211,20 @@ def compute_mentions(column):
             return True
         used.add(pos)
 
-    pending = dict()
+    pending = defaultdict(list)
     mentions = []
     for i, cell in enumerate(column):
-        for m in CONLL_MENTION_PATTERN.finditer(cell):
-            if m.lastgroup == 'mono':
+        # most cells are just "*", "-" or "_": don't run the regex on them
+        if '(' not in cell and ')' not in cell:
+            continue
+        for kind, chain in _parse_cell(cell):
+            if kind == 'mono':
                 pos = (i, i+1)
-                chain = int(m.group(m.lastgroup))
                 if not is_duplicated(pos):
                     mentions.append((pos, chain))
-            elif m.lastgroup == 'start':
-                chain = int(m.group(m.lastgroup))
-                if not chain in pending:
-                    pending[chain] = []
+            elif kind == 'start':
                 pending[chain].append(i)
-            elif m.lastgroup == 'end':
-                chain = int(m.group(m.lastgroup))
+            elif kind == 'end':
                 pos = (pending[chain].pop(), i+1)
                 if not is_duplicated(pos):
                     mentions.append((pos, chain))
@@ -237,16 +295,14 @@ def sentpos2textpos(mentions, sents):
     compute the sentence boundaries.
     """
 
-    offset = 0
-    sent2text = []
-    for sent in sents:
-        sent2text.append([i+offset for i in range(len(sent))])
-        offset += len(sent)
+    # offset of the first token of each sentence
+    offsets = list(accumulate(map(len, sents), initial=0))
 
     for mention in mentions:
         sent, start, stop = mention
+        offset = offsets[sent]
         mention.clear()
-        mention.extend((sent2text[sent][start], sent2text[sent][stop]))
+        mention.extend((offset + start, offset + stop))
 
 
 
@@ -261,19 +317,17 @@ def textpos2sentpos(mentions, sents):
     compute the sentence boundaries.
     """
 
-    mapping = [
-        (i, j)
-        for i, sent in enumerate(sents)
-            for j, token in enumerate(sent)
-    ]
+    # offset of the first token of each sentence
+    offsets = list(accumulate(map(len, sents), initial=0))
 
     for mention in mentions:
         start, stop = mention
-        sent_start, start = mapping[start]
-        sent_stop, stop = mapping[stop]
+        sent_start = bisect_right(offsets, start) - 1
+        sent_stop = bisect_right(offsets, stop) - 1
         assert sent_start == sent_stop
+        offset = offsets[sent_start]
         mention.clear()
-        mention.extend([sent_start, start, stop])
+        mention.extend([sent_start, start - offset, stop - offset])
 
 
 
@@ -291,37 +345,36 @@ def write_chains(sents, chains, append=False, no_chain_char="-"):
 
     if isinstance(chains, dict):
         chains = list(chains.values())
-    starts = dict() # {sent: {index: [chain_ids]} }
-    ends = dict() # {sent: {index: [chain_ids]} }
-    monos = dict() # {sent: {index: [chain_ids]} }
+
+    def new_sent_dict():
+        # {index: array_of_chain_ids}
+        return defaultdict(partial(array, 'i'))
+
+    # {sent: {index: array_of_chain_ids}}: mentions in sentences that are not
+    # in `sents` are ignored
+    starts = defaultdict(new_sent_dict)
+    ends = defaultdict(new_sent_dict)
+    monos = defaultdict(new_sent_dict)
     for c, chain in enumerate(chains):
         for sent, start, end in chain:
             if start == end:
-                if sent not in monos:
-                    monos[sent] = dict()
-                if start not in monos[sent]:
-                    monos[sent][start] = []
                 monos[sent][start].append(c)
             else:
-                if sent not in starts:
-                    starts[sent] = dict()
-                if start not in starts[sent]:
-                    starts[sent][start] = []
                 starts[sent][start].append(c)
-                if sent not in ends:
-                    ends[sent] = dict()
-                if end not in ends[sent]:
-                    ends[sent][end] = []
                 ends[sent][end].append(c)
+    empty = dict()
     for s, sent in enumerate(sents):
+        sent_monos = monos.get(s, empty)
+        sent_starts = starts.get(s, empty)
+        sent_ends = ends.get(s, empty)
         for t, tok in enumerate(sent):
             res = []
-            if s in monos and t in monos[s]:
-                res.extend(["(%d)" % c for c in monos[s][t]])
-            if s in starts and t in starts[s]:
-                res.extend(["(%d" % c for c in starts[s][t]])
-            if s in ends and t in ends[s]:
-                res.extend(["%d)" % c for c in ends[s][t]])
+            if t in sent_monos:
+                res.extend(["(%d)" % c for c in sent_monos[t]])
+            if t in sent_starts:
+                res.extend(["(%d" % c for c in sent_starts[t]])
+            if t in sent_ends:
+                res.extend(["%d)" % c for c in sent_ends[t]])
             res = "|".join(res) if res else no_chain_char
             if append:
                 tok.append(res)
@@ -374,11 +427,13 @@ def filter_pos(mentions, sents, unwanted_pos):
             ...
         ]
 
-    `unwanted_pos` is a list of unwanted pos.
+    `unwanted_pos` is a list (or any iterable) of unwanted pos.
 
     Return a new mentions list (like `mentions`).
     """
 
+    unwanted_pos = frozenset(unwanted_pos or ())
+
     # reminder: `sents[sent][start][4]` is the POS
     return [
         (sent, start, end)
@@ -391,8 +446,14 @@ def filter_pos(mentions, sents, unwanted_pos):
 def check_no_duplicate_mentions(chains):
     """Return True if there is no duplicate mentions."""
 
-    mentions = [ m for c in chains for m in c ]
-    return len(mentions) == len(set(mentions))
+    seen = set()
+    add = seen.add
+    for c in chains:
+        for m in c:
+            if m in seen:
+                return False
+            add(m)
+    return True
 
 
 
@@ -454,28 +515,39 @@ def merge_boundaries(coref_docs, boundary_docs, unwanted_pos=None):
         write_chains(coref_sents, chains)
 
 
-def remove_col(docs, *cols):
+def remove_col(docs, *cols, confirm=False):
     """Remove columns *cols from all tokens in docs.
 
     Columns indices may be negative.
 
     Return a new collections of docs, don't touch the original.
+
+    The function is experimental: if `confirm` is true, it asks for a
+    confirmation on the standard input before doing anything.
     """
-    input("experimental")
+
+    if confirm:
+        input("experimental")
+
+    if not cols:
+        get_cols = lambda tok: []
+    elif len(cols) == 1:
+        col = cols[0]
+        get_cols = lambda tok: [tok[col]]
+    else:
+        getter = itemgetter(*cols)
+        get_cols = lambda tok: list(getter(tok))
 
     docs = \
     [
-        [        
-            [
-                [ tok[col] for col in cols ]
-                for tok in sent
-            ] for sent in doc
+        [
+            list(map(get_cols, sent)) for sent in doc
         ]
         for doc in docs
     ]
 
     return docs
-    
+
 
 
 
@@ -556,13 +628,12 @@ def to_corefcol(infpath, outfpath):
     Assume there is no space inside a cell.
     """
 
-    fh = open(outfpath, 'w')
-    for line in open(infpath):
-        if line.startswith("#") or line == "\n":
-            fh.write(line)
-        else:
-            fh.write(line.split()[-1] + "\n")
-    fh.close()
+    # text mode, so that all the newlines are read as "\n"
+    with open(infpath) as inf, open(outfpath, 'w', buffering=1<<20) as outf:
+        for line in inf:
+            if not (line.startswith("#") or line == "\n"):
+                line = line.split()[-1] + "\n"
+            outf.write(line)
 
 
 
@@ -634,20 +705,23 @@ def merge_amalgams(docs, amalgams, reset_cols=True, outfpath=None, sep=None):
     for id_, doc_sents in docs.items():
         amalgam_sents = amalgams[id_]
         for doc_sent, amalgam_sent in zip(doc_sents, amalgam_sents):
-            d, a = 0, 0
-            while d < len(doc_sent):
-                if doc_sent[d][0] == amalgam_sent[a][0]:
-                    d, a = d+1, a+1
-                    continue
-                if "-" not in amalgam_sent[a][0]:
-                    raise RuntimeError(f"not an amalgam: {amalgam_sent[a]}")
-                if reset_cols:
-                    new_amalgam = amalgam_sent[a][:2] \
-                        + ["_"] * (len(doc_sent[d])-2)
-                else:
-                    new_amalgam = amalgam_sent[a]
-                doc_sent.insert(d, new_amalgam)
-                d, a = d+1, a+1
+            merged = []
+            a = 0
+            for tok in doc_sent:
+                while tok[0] != amalgam_sent[a][0]:
+                    if "-" not in amalgam_sent[a][0]:
+                        raise RuntimeError(
+                            f"not an amalgam: {amalgam_sent[a]}")
+                    if reset_cols:
+                        new_amalgam = amalgam_sent[a][:2] \
+                            + ["_"] * (len(tok)-2)
+                    else:
+                        new_amalgam = amalgam_sent[a]
+                    merged.append(new_amalgam)
+                    a += 1
+                merged.append(tok)
+                a += 1
+            doc_sent[:] = merged
 
     if outfpath:
         write_file(outfpath, docs, sep=sep)
@@ -56,11 +56,24 @@ Example command (merging + output uses tabulation):
 """
 
 import argparse
-import json
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
 
 import conll_transform
 
 
+def iter_docs(*fpaths):
+    """Yield the documents (dictionaries) of the given jsonlines files."""
+
+    for fpath in fpaths:
+        with open(fpath, 'rb', buffering=1<<20) as fh:
+            for line in fh:
+                yield loads(line)
+
+
 def jsonlines2conll(*fpaths, cols=None, predicted_clusters=True,
         merge_with=None, outfpath=None, tabsep=False):
 
@@ -69,17 +82,20 @@ def jsonlines2conll(*fpaths, cols=None, predicted_clusters=True,
 
     docs = dict()
 
-    for line in (l for fpath in fpaths for l in open(fpath)):
+    for data in iter_docs(*fpaths):
 
-        data = json.loads(line)
         doc_key = data["doc_key"]
 
-        sents = [
-            # token is just right: a tuple of col
-            [list(token) for token in zip(*sent)]
-            # sent is: [ sent1_tokens, sent2_speakers,... ]
-            for sent in zip(*[iter(data[col]) for col in cols])
-        ]
+        if len(cols) == 1:
+            # token is just a list with one cell
+            sents = [[[cell] for cell in sent] for sent in data[cols[0]]]
+        else:
+            sents = [
+                # token is just right: a tuple of col
+                list(map(list, zip(*sent)))
+                # sent is: [ sent1_tokens, sent2_speakers,... ]
+                for sent in zip(*[data[col] for col in cols])
+            ]
 
         chains = data['predicted_clusters'
             if predicted_clusters else 'clusters']
@@ -138,7 +154,7 @@ def main():
 
     if args.conll_files:
         merge_with = conll_transform.read_files(*args.conll_files,
-            sep="\t" if args.intabsep else None)
+            sep="\t" if args.intabsep else None, intern_cols=True)
     else:
         merge_with = None
 
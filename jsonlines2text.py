@@ -17,7 +17,13 @@ Use the `-h` and `--help` switches to get a detailed list of options.
 
 
 import argparse
-import json
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+from functools import cache
+from itertools import chain
 
 from standoff2inline import Highlighter, highlight
 from color_manager import ColorManager, CommonColorManager
@@ -25,19 +31,23 @@ from color_manager import ColorManager, CommonColorManager
 
 
 def sort_mentions(clusters):
-    res = []
-    for cluster in clusters:
-        cluster = sorted(cluster, key=lambda x: x[1], reverse=True)
-        cluster = sorted(cluster, key=lambda x: x[0])
-        res.append(cluster)
-    return res
+    # start ascending, end descending
+    return [sorted(cluster, key=lambda x: (x[0], -x[1]))
+        for cluster in clusters]
 
 
 
 def sort_clusters(clusters):
-    clusters = sorted(clusters, key=lambda x: x[0][1], reverse=True)
-    clusters = sorted(clusters, key=lambda x: x[0][0])
-    return clusters
+    # first mention: start ascending, end descending
+    return sorted(clusters, key=lambda x: (x[0][0], -x[0][1]))
+
+
+
+
+@cache
+def make_spans(color):
+    """Return the opening and closing span tags for the `color`."""
+    return f'<span style="color: {color};">', "</span>"
 
 
 
@@ -66,6 +76,16 @@ def highlight_clusters(tokens, clusters, paragraphs, *, singleton_color,
             hl.add_mark(start, end)
         hls.append(hl)
 
+    # the same markers are used for all the singletons
+    if singleton_color != "":
+        color = (cm.gray if cm else 'gray') \
+            if singleton_color is None else singleton_color
+        start_span, end_span = make_spans(color)
+        singleton_prefix = f'{start_span}[{end_span}'
+        singleton_suffix = f'{start_span}]{end_span}'
+
+    get_next_color = cm.get_next_color if cm else lambda: "black"
+
     counter = 1
 
     for i, cluster in enumerate(clusters, start=1):
@@ -74,17 +94,11 @@ def highlight_clusters(tokens, clusters, paragraphs, *, singleton_color,
             if singleton_color == "":
                 pass
             else:
-                color = (cm.gray if cm else 'gray') \
-                    if singleton_color is None else singleton_color
-                start_span = f'<span style="color: {color};">'
-                end_span = "</span>"
                 hl = Highlighter(
-                    prefix=f'{start_span}[{end_span}',
-                    suffix=f'{start_span}]{end_span}')
+                    prefix=singleton_prefix,
+                    suffix=singleton_suffix)
         else:
-            color = cm.get_next_color() if cm else "black"
-            start_span = f'<span style="color: {color};">'
-            end_span = "</span>"
+            start_span, end_span = make_spans(get_next_color())
             index = f"<sub>{counter}</sub>{end_span}" if add_indices else ""
             hl = Highlighter(
                 prefix=f"<b>{start_span}[{end_span}",
@@ -107,25 +121,20 @@ def highlight_clusters(tokens, clusters, paragraphs, *, singleton_color,
 
 def filter_tokens(tokens, clusters, n):
     tokens = tokens[:n]
-    new_clusters = []
-    for cluster in clusters:
-        new_cluster = []
-        for mention in cluster:
-            if mention[0] < n and mention[1] < n:
-                new_cluster.append(mention)
-        if new_cluster:
-            new_clusters.append(new_cluster)
+    # a mention starts before it ends, so checking the end is enough
+    new_clusters = [[m for m in cluster if m[1] < n] for cluster in clusters]
+    new_clusters = [cluster for cluster in new_clusters if cluster]
     return tokens, new_clusters
 
 
 
 def convert(doc, gold, n, **kwargs):
-    tokens = [t for sent in doc['sentences'] for t in sent]
+    tokens = list(chain.from_iterable(doc['sentences']))
     if gold:
         clusters = doc.get('clusters', list())
     else:
         clusters = doc.get('predicted_clusters', doc.get('clusters', list()))
-    if n:
+    if n and n < len(tokens):
         tokens, clusters = filter_tokens(tokens, clusters, n)
     paragraphs = doc.get('paragraphs')
     res = highlight_clusters(tokens, clusters, paragraphs, **kwargs)
@@ -170,18 +179,20 @@ def parse_args():
 
 def main():
     args = parse_args()
-    res = ""
-    for line in open(args.infpath):
-        doc = json.loads(line)
-        if args.heading:
-            if "%s" in args.heading:
-                res += args.heading % doc['doc_key']
-            else:
-                res += args.heading
-        res += convert(doc, n=args.n, gold=args.gold,
-            singleton_color=args.singleton_color,
-            color_manager=args.color_manager, add_indices=args.add_indices
-        )
+    parts = []
+    with open(args.infpath, 'rb', buffering=1<<20) as fh:
+        for line in fh:
+            doc = loads(line)
+            if args.heading:
+                if "%s" in args.heading:
+                    parts.append(args.heading % doc['doc_key'])
+                else:
+                    parts.append(args.heading)
+            parts.append(convert(doc, n=args.n, gold=args.gold,
+                singleton_color=args.singleton_color,
+                color_manager=args.color_manager, add_indices=args.add_indices
+            ))
+    res = "".join(parts)
     if args.outfpath:
         open(args.outfpath, 'w').write(res)
     else:
@@ -22,9 +22,9 @@ from __future__ import annotations
 
 import argparse
 from argparse import Namespace
-from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Callable, Iterator
 
 from sacr_parser2 import (
     MentionEnd,
@@ -32,6 +32,7 @@ from sacr_parser2 import (
     ParagraphEnd,
     SacrParser,
     Spaces,
+    Token,
     Word,
 )
 
@@ -39,7 +40,7 @@ DEFAULT_MENTION_TYPE = "Mention"
 DEFAULT_RELATION_TYPE = "Coreference"
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Annotation:
     index: int
     kind: str
@@ -48,92 +49,110 @@ class Annotation:
         return self.index == other.index and self.kind == other.kind
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class TextAnnotation(Annotation):
     start: int
     end: int
 
     def __eq__(self, other: TextAnnotation) -> bool:
         return (
-            super().__eq__(other)
+            Annotation.__eq__(self, other)
             and self.start == other.start
             and self.end == other.end
         )
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class RelationAnnotation(Annotation):
     source: Annotation
     target: Annotation
 
     def __eq__(self, other: RelationAnnotation) -> bool:
         return (
-            super().__eq__(other)
+            Annotation.__eq__(self, other)
             and self.source == other.source
             and self.target == other.target
         )
 
 
+@dataclass
+class _ConversionState:
+    text_parts: list[str] = field(default_factory=list)
+    text_len: int = 0
+    annotations: list[Annotation] = field(default_factory=list)
+    text_annotation_count: int = 0
+    relation_annotation_count: int = 0
+    # chain index -> last mention of the chain
+    last_mentions: dict[int, TextAnnotation] = field(default_factory=dict)
+    filo: list[TextAnnotation] = field(default_factory=list)
+
+
 class Sacr2AnnConverter:
     def __init__(self, type_property_name: str | None = None):
         self.type_property_name = type_property_name
         self._text: str | None = None
         self._annotations: list[Annotation] | None = None
+        # parser tokens are dispatched on their exact type
+        self._dispatch: dict[type[Token], Callable[[Any, _ConversionState], None]] = {
+            Word: self._on_text,
+            Spaces: self._on_text,
+            ParagraphEnd: self._on_paragraph_end,
+            MentionStart: self._on_mention_start,
+            MentionEnd: self._on_mention_end,
+        }
 
     def convert(self, source: str | Path) -> None:
         parser = SacrParser(source=source)
+        state = _ConversionState()
 
-        text: str = ""
-        annotations: list[Annotation] = []
-        text_annotation_count: int = 0
-        relation_annotation_count: int = 0
-
-        chains: dict[int, list[TextAnnotation]] = defaultdict(list)
-        filo: list[TextAnnotation] = []
-
+        get_handler = self._dispatch.get
         for token in parser.parse():
-            start_position = len(text)
-
-            if isinstance(token, (Word, Spaces)):
-                text += token.value
-            elif isinstance(token, ParagraphEnd):
-                text += "\n\n"
-
-            elif isinstance(token, MentionStart):
-                text_annotation_count += 1
-                if self.type_property_name:
-                    kind = token.features.get(
-                        self.type_property_name, DEFAULT_MENTION_TYPE
-                    )
-                else:
-                    kind = DEFAULT_MENTION_TYPE
-                text_annotation = TextAnnotation(
-                    index=text_annotation_count,
-                    kind=kind,
-                    start=start_position,
-                    end=0,
-                )
-                filo.append(text_annotation)
-                annotations.append(text_annotation)
-
-                if token.chain_index in chains:
-                    relation_annotation_count += 1
-                    relation_annotation = RelationAnnotation(
-                        index=relation_annotation_count,
-                        kind=DEFAULT_RELATION_TYPE,
-                        source=chains[token.chain_index][-1],
-                        target=text_annotation,
-                    )
-                    annotations.append(relation_annotation)
-
-                chains[token.chain_index].append(text_annotation)
+            handler = get_handler(type(token))
+            if handler is not None:
+                handler(token, state)
+
+        self._text = "".join(state.text_parts)
+        self._annotations = state.annotations
+
+    def _on_text(self, token: Word | Spaces, state: _ConversionState) -> None:
+        state.text_parts.append(token.value)
+        state.text_len += len(token.value)
+
+    def _on_paragraph_end(self, token: ParagraphEnd, state: _ConversionState) -> None:
+        state.text_parts.append("\n\n")
+        state.text_len += 2
+
+    def _on_mention_start(self, token: MentionStart, state: _ConversionState) -> None:
+        state.text_annotation_count += 1
+        if self.type_property_name:
+            kind = token.features.get(self.type_property_name, DEFAULT_MENTION_TYPE)
+        else:
+            kind = DEFAULT_MENTION_TYPE
+        text_annotation = TextAnnotation(
+            index=state.text_annotation_count,
+            kind=kind,
+            start=state.text_len,
+            end=0,
+        )
+        state.filo.append(text_annotation)
+        state.annotations.append(text_annotation)
+
+        previous = state.last_mentions.get(token.chain_index)
+        if previous is not None:
+            state.relation_annotation_count += 1
+            relation_annotation = RelationAnnotation(
+                index=state.relation_annotation_count,
+                kind=DEFAULT_RELATION_TYPE,
+                source=previous,
+                target=text_annotation,
+            )
+            state.annotations.append(relation_annotation)
 
-            elif isinstance(token, MentionEnd):
-                text_annotation = filo.pop()
-                text_annotation.end = len(text)
+        state.last_mentions[token.chain_index] = text_annotation
 
-        self._text = text
-        self._annotations = annotations
+    def _on_mention_end(self, token: MentionEnd, state: _ConversionState) -> None:
+        text_annotation = state.filo.pop()
+        text_annotation.end = state.text_len
 
     @property
     def text(self) -> str:
@@ -154,25 +173,30 @@ class Sacr2AnnConverter:
 
     @staticmethod
     def _convert_annotations_as_string(text: str, annotations: list[Annotation]) -> str:
-        string = ""
+        return "".join(Sacr2AnnConverter._iter_annotation_lines(text, annotations))
+
+    @staticmethod
+    def _iter_annotation_lines(
+        text: str, annotations: list[Annotation]
+    ) -> Iterator[str]:
         for annotation in annotations:
             if isinstance(annotation, TextAnnotation):
                 span = text[annotation.start : annotation.end]
-                string += f"T{annotation.index}\t{annotation.kind} {annotation.start} {annotation.end}\t{span}\n"
+                yield f"T{annotation.index}\t{annotation.kind} {annotation.start} {annotation.end}\t{span}\n"
             elif isinstance(annotation, RelationAnnotation):
-                string += f"R{annotation.index}\t{annotation.kind} Arg1:T{annotation.source.index} Arg2:T{annotation.target.index}\n"
+                yield f"R{annotation.index}\t{annotation.kind} Arg1:T{annotation.source.index} Arg2:T{annotation.target.index}\n"
             else:
                 raise RuntimeError(
                     "unknown annotation type: " + annotation.__class__.__name__
                 )
-        return string
 
     @property
     def annotations_as_string(self) -> str:
         return self._convert_annotations_as_string(self.text, self.annotations)
 
     def write_annotations_to_file(self, file: Path) -> None:
-        file.write_text(self.annotations_as_string)
+        with file.open("w") as fh:
+            fh.writelines(self._iter_annotation_lines(self.text, self.annotations))
 
 
 def convert(
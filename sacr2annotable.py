@@ -21,7 +21,9 @@ dataframes = corpus.get_dataframes()
 from __future__ import annotations
 
 import re
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Callable
 
 from annotable import Corpus, Mention, Paragraph, Sentence, Text, Token
 from sacr_parser2 import (
@@ -33,68 +35,100 @@ from sacr_parser2 import (
     SentenceChange,
     Spaces,
     TextID,
-    Word,
 )
+from sacr_parser2 import Token as ParserToken
+from sacr_parser2 import Word
 
 TEXT_METADATA_PATTERN = re.compile(r"textmetadata\s*:\s*(\w+)\s*=\s*(.*)")
 
 
+@dataclass
+class _ConversionState:
+    text: Text = field(default_factory=Text)
+    current_paragraph: Paragraph = field(default_factory=Paragraph)
+    current_sentence: Sentence = field(default_factory=Sentence)
+    filo: list[Mention] = field(default_factory=list)
+
+
 class Sacr2AnnotableConverter:
     def __init__(self) -> None:
         self.corpus: Corpus = Corpus()
+        # parser tokens are dispatched on their exact type
+        self._dispatch: dict[
+            type[ParserToken], Callable[[Any, _ConversionState], None]
+        ] = {
+            Spaces: self._on_spaces,
+            Word: self._on_word,
+            TextID: self._on_text_id,
+            ParagraphEnd: self._on_paragraph_end,
+            SentenceChange: self._on_sentence_change,
+            MentionStart: self._on_mention_start,
+            MentionEnd: self._on_mention_end,
+            Comment: self._on_comment,
+        }
 
     def convert_text(self, source: str | Path) -> None:
         parser = SacrParser(source=source)
+        state = _ConversionState()
 
-        text: Text = Text()
-        current_paragraph: Paragraph = Paragraph()
-        current_sentence: Sentence = Sentence()
-        filo: list[Mention] = []
-
+        get_handler = self._dispatch.get
         for token in parser.parse():
-            if isinstance(token, Spaces):
-                for mention in filo:
-                    mention.string += token.value
-
-            elif isinstance(token, Word):
-                t = Token(token.start, token.end, token.value)
-                for mention in filo:
-                    mention.add_token(t)
-                    mention.string += token.value
-                current_sentence.add_token(t)
-
-            elif isinstance(token, TextID):
-                text.name = token.text_id
-
-            elif isinstance(token, ParagraphEnd):
-                if current_sentence.token_count:
-                    current_paragraph.add_sentence(current_sentence)
-                    current_sentence = Sentence()
-                text.add_paragraph(current_paragraph)
-                current_paragraph = Paragraph()
-
-            elif isinstance(token, SentenceChange):
-                if current_sentence.token_count:
-                    current_paragraph.add_sentence(current_sentence)
-                    current_sentence = Sentence()
-
-            elif isinstance(token, MentionStart):
-                mention = Mention(chain_name=token.chain_name, string="")
-                for k, v in token.features.items():
-                    mention[k] = v
-                current_sentence.add_mention(mention)
-                filo.append(mention)
-
-            elif isinstance(token, MentionEnd):
-                filo.pop()
-
-            elif isinstance(token, Comment):
-                if m := TEXT_METADATA_PATTERN.fullmatch(token.value):
-                    text.metadata[m.group(1)] = m.group(2)
-
-        if current_sentence.token_count:
-            current_paragraph.add_sentence(current_sentence)
-        if current_paragraph.sentence_count:
-            text.add_paragraph(current_paragraph)
+            handler = get_handler(type(token))
+            if handler is not None:
+                handler(token, state)
+
+        text = state.text
+        if state.current_sentence.token_count:
+            state.current_paragraph.add_sentence(state.current_sentence)
+        if state.current_paragraph.sentence_count:
+            text.add_paragraph(state.current_paragraph)
 
         self.corpus.add_text(text)
+
+    @staticmethod
+    def _on_spaces(token: Spaces, state: _ConversionState) -> None:
+        for mention in state.filo:
+            mention.string += token.value
+
+    @staticmethod
+    def _on_word(token: Word, state: _ConversionState) -> None:
+        t = Token(token.start, token.end, token.value)
+        for mention in state.filo:
+            mention.add_token(t)
+            mention.string += token.value
+        state.current_sentence.add_token(t)
+
+    @staticmethod
+    def _on_text_id(token: TextID, state: _ConversionState) -> None:
+        state.text.name = token.text_id
+
+    @staticmethod
+    def _on_paragraph_end(token: ParagraphEnd, state: _ConversionState) -> None:
+        if state.current_sentence.token_count:
+            state.current_paragraph.add_sentence(state.current_sentence)
+            state.current_sentence = Sentence()
+        state.text.add_paragraph(state.current_paragraph)
+        state.current_paragraph = Paragraph()
+
+    @staticmethod
+    def _on_sentence_change(token: SentenceChange, state: _ConversionState) -> None:
+        if state.current_sentence.token_count:
+            state.current_paragraph.add_sentence(state.current_sentence)
+            state.current_sentence = Sentence()
+
+    @staticmethod
+    def _on_mention_start(token: MentionStart, state: _ConversionState) -> None:
+        mention = Mention(chain_name=token.chain_name, string="")
+        for k, v in token.features.items():
+            mention[k] = v
+        state.current_sentence.add_mention(mention)
+        state.filo.append(mention)
+
+    @staticmethod
+    def _on_mention_end(token: MentionEnd, state: _ConversionState) -> None:
+        state.filo.pop()
+
+    @staticmethod
+    def _on_comment(token: Comment, state: _ConversionState) -> None:
+        if m := TEXT_METADATA_PATTERN.fullmatch(token.value):
+            state.text.metadata[m.group(1)] = m.group(2)
@@ -30,16 +30,51 @@ You can remove the speaker for a paragraph by setting:
 """
 
 
+import functools
+import io
 import os
 import argparse
 import re
+import sys
 
 import sacr_parser
 
 __version__ = "1.0.0"
 
+# a mention starting and ending on the same token: "(1_1)" -> "(1)"
+MONO_MENTION_PATTERN = re.compile(r"\((\d+)_\1\)")
+
+
+@functools.lru_cache(maxsize=4096)
+def format_corefcol(starts, ends):
+    """Return the coreference cell of a token, given the tuples of the chains
+    starting and ending on it.  Memoized, since most tokens have none.
+    """
+
+    corefcol = "_".join(
+        ["(%d" % x for x in starts] + ["%d)" % x for x in ends]
+    )
+    if "_" in corefcol:
+        corefcol = MONO_MENTION_PATTERN.sub(r"(\1)", corefcol)
+    return corefcol or "-"
+
 
 def read_file(fpath, index, docname=None, part_is_index=True, include_speaker=False):
+    """Convert a sacr file and return the conll document as a string."""
+
+    out = io.StringIO()
+    write_file(
+        out, fpath, index, docname=docname, part_is_index=part_is_index,
+        include_speaker=include_speaker
+    )
+    return out.getvalue()
+
+
+def write_file(out, fpath, index, docname=None, part_is_index=True,
+        include_speaker=False):
+    """Convert a sacr file and write the conll document to the `out` file
+    object, line by line.
+    """
 
     parser = sacr_parser.SacrParser(
         fpath=fpath,
@@ -47,8 +82,8 @@ def read_file(fpath, index, docname=None, part_is_index=True, include_speaker=Fa
     )
 
     tokens = []
-    starts = dict()  # start -> {ids}
-    ends = dict()  # end -> {ids}
+    starts = []  # start -> [ids]
+    ends = []  # end -> [ids]
     sentences = set()  # index of last tokens
 
     filo = []
@@ -68,8 +103,8 @@ def read_file(fpath, index, docname=None, part_is_index=True, include_speaker=Fa
         elif item == "mention_start":
             chain = params[0]
             l = len(tokens)
-            if l not in starts:
-                starts[l] = []
+            while len(starts) <= l:
+                starts.append([])
             starts[l].append(chain)
             filo.append(chain)
 
@@ -80,43 +115,40 @@ def read_file(fpath, index, docname=None, part_is_index=True, include_speaker=Fa
         elif item == "mention_end":
             chain = filo.pop()
             l = len(tokens) - 1
-            if l not in ends:
-                ends[l] = []
-            ends[l].append(chain)
+            if l >= 0:  # otherwise, the mention is empty
+                while len(ends) <= l:
+                    ends.append([])
+                ends[l].append(chain)
 
         elif item == "token":
             tokens.append((params, speaker))
 
-    lines = []
-
-    counter = 0
-    for i, (token, speaker) in enumerate(tokens):
-        if i in sentences:
-            lines.append("")
-            counter = 0
-        corefcol = "_".join(
-            # ["(%d)" % x for x in (starts[i]
-            #  if (i in starts and i in ends) else [])]
-            # + ["(%d" % x for x in (starts[i]
-            ["(%d" % x for x in (starts[i] if i in starts else [])]
-            + ["%d)" % x for x in (ends[i] if i in ends else [])]
-        )
-        corefcol = re.sub(r"\((\d+)_\1\)", r"(\1)", corefcol)
-        if not corefcol:
-            corefcol = "-"
-        if include_speaker:
-            cols = [str(counter), token, speaker, corefcol]
-        else:
-            cols = [str(counter), token, corefcol]
-        lines.append("\t".join(cols))
-        counter += 1
-
     if not docname:
         docname = textid if textid else os.path.basename(fpath)
-    res = "#begin document (%s); part %03d\n" % (docname, index if part_is_index else 0)
-    res += "\n".join(lines)
-    res += "\n#end document\n"
-    return res
+    out.write("#begin document (%s); part %03d\n" % (docname, index if part_is_index else 0))
+    if not tokens:
+        out.write("\n")
+
+    # sentence spans: (start, stop)
+    bounds = [0] + sorted(x for x in sentences if x < len(tokens)) + [len(tokens)]
+
+    for start, stop in zip(bounds, bounds[1:]):
+        if start:
+            out.write("\n")
+        for counter, i in enumerate(range(start, stop)):
+            token, speaker = tokens[i]
+            corefcol = format_corefcol(
+                tuple(starts[i]) if i < len(starts) else (),
+                tuple(ends[i]) if i < len(ends) else (),
+            )
+            if include_speaker:
+                cols = [str(counter), token, speaker, corefcol]
+            else:
+                cols = [str(counter), token, corefcol]
+            out.write("\t".join(cols))
+            out.write("\n")
+
+    out.write("#end document\n")
 
 
 def parse_args():
@@ -170,18 +202,22 @@ def parse_args():
 
 def main():
     args = parse_args()
-    res = []
-    for i, fpath in enumerate(args.infpaths):
-        res.append(
-            read_file(
-                fpath, index=i, docname=args.docname, part_is_index=args.part_is_index, include_speaker=args.speaker
-            )
-        )
-    res = "\n\n".join(res)
     if args.outfpath:
-        open(args.outfpath, "w").write(res)
+        out = open(args.outfpath, "w", buffering=1 << 20)
     else:
-        print(res)
+        out = sys.stdout
+    try:
+        for i, fpath in enumerate(args.infpaths):
+            if i:
+                out.write("\n\n")
+            write_file(
+                out, fpath, index=i, docname=args.docname, part_is_index=args.part_is_index, include_speaker=args.speaker
+            )
+        if not args.outfpath:
+            out.write("\n")  # as print() did
+    finally:
+        if args.outfpath:
+            out.close()
 
 
 if __name__ == "__main__":
@@ -32,22 +32,43 @@ or as a library, for example in a Jupyter notebook:
     print(dfs.text_mentions.head())
     print(dfs.text_consecutive_relations.head())
     print(dfs.text_to_first_relations.head())
+
+To convert many files in several processes, use `--workers N` (or
+`workers=N`).
 """
 
 import argparse
 from argparse import Namespace
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-from annotable import DataFrameSet
+from annotable import DataFrameSet, Text
 from sacr2annotable import Sacr2AnnotableConverter
 
+# below this number of files, starting the processes and sending the texts
+# back costs more than converting the files
+PARALLEL_MIN_FILE_COUNT = 4
+
+
+def _convert_file(file: Path) -> Text:
+    conv = Sacr2AnnotableConverter()
+    conv.convert_text(file)
+    return next(conv.corpus.texts)
+
 
 def convert_sacr_files_to_dataframes(
-    *files: Path, output_file: Path | None = None
+    *files: Path, output_file: Path | None = None, workers: int = 1
 ) -> DataFrameSet:
     conv = Sacr2AnnotableConverter()
-    for file in files:
-        conv.convert_text(file)
+    if workers > 1 and len(files) >= PARALLEL_MIN_FILE_COUNT:
+        # files are independent: they are converted in worker processes, and
+        # the texts are added to the corpus in the order of the files
+        with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+            for text in pool.map(_convert_file, files):
+                conv.corpus.add_text(text)
+    else:
+        for file in files:
+            conv.convert_text(file)
     corpus = conv.corpus
 
     if output_file:
@@ -69,6 +90,13 @@ def parse_args() -> Namespace:
         required=True,
         help="output file. This is a zip file containing the csv",
     )
+    parser.add_argument(
+        "--workers",
+        "-j",
+        type=int,
+        default=1,
+        help=f"number of processes converting the files (default is 1). Only used with at least {PARALLEL_MIN_FILE_COUNT} files",
+    )
     args = parser.parse_args()
     return args
 
@@ -78,6 +106,7 @@ def main() -> None:
     convert_sacr_files_to_dataframes(
         *[Path(f) for f in args.input_files],
         output_file=Path(args.output_file),
+        workers=args.workers,
     )
 
 
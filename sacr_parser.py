@@ -48,11 +48,24 @@ Note that spaces are not yielded as token.
 
 __version__ = "1.0.0"
 
+import functools
 import re
 
 WORD_TOKENIZATION = 1
 CHAR_TOKENIZATION = 2
 
+ADDITIONAL_TOKENS_PATTERN = re.compile(r"#additional_?token:\s*(.+)\s*\n\n+")
+TEXT_ID_PATTERN = re.compile(r"#text_?id:\s*(.+)\s*\n\n*")
+COMMENT_PATTERN = re.compile(r"(?:#(.*)\n+|\*{5,})")
+END_PAR_PATTERN = re.compile(r"\n\n+")
+SPACE_PATTERN = re.compile(r"\s+")
+NEW_LINE_PATTERN = re.compile(r"\n")
+OPEN_MENTION_PATTERN = re.compile(r"\{(?P<chain_name>\w+)(?P<open_mention_sep>:| )")
+FEATURE_PATTERN = re.compile(r'(\w+)=(?:(\w+)|"([^"]*)")(,| )')
+CLOSE_MENTION_PATTERN = re.compile(r"\}")
+SENTENCE_END_PATTERN = re.compile(r'(?:\.+"?|\!|\?)')
+ANY_CHAR_PATTERN = re.compile(r".")
+
 
 def escape_regex(string):
     """Escape a string so it can be literally search for in a regex.
@@ -75,21 +88,59 @@ class SacrParser:
     """
 
     @staticmethod
+    @functools.lru_cache(maxsize=32)
     def get_word_regex(additional_tokens=None):
-        """Compute the regex to match words, including additional_tokens."""
+        """Compute the regex to match words, including additional_tokens.
+
+        `additional_tokens` must be hashable (eg a tuple): the regexes are
+        cached.
+        """
         if not additional_tokens:
-            addtional_tokens = []
+            additional_tokens = []
         additional_tokens = sorted(
             [escape_regex(w) for w in additional_tokens], key=lambda x: len(x)
         )
         token_str = "[a-zßàáâãäåæçèéêëìíîïðñòóôõöøùúûüýþÿœα-ω0-9_]+'?|[-+±]?[.,]?[0-9]+"
         if additional_tokens:
             return re.compile(
-                "([%d]+|%s)" % (token_str, "|".join(additional_tokens)), re.I
+                "(%s|%s)" % (token_str, "|".join(additional_tokens)), re.I
             )
         else:
             return re.compile("(%s)" % token_str, re.I)
 
+    @staticmethod
+    def get_paragraph_regexes(word_pattern):
+        """Combine everything that can be found inside a paragraph into one
+        regex, so that each element is found with a single match.
+
+        The alternatives are tried in order.  Return two regexes: the first one
+        is used outside of mentions, the second one inside mentions (no
+        sentence ends).
+        """
+        alternatives = [
+            ("end_par", END_PAR_PATTERN),
+            ("space", SPACE_PATTERN),
+            ("new_line", NEW_LINE_PATTERN),
+            ("open_mention", OPEN_MENTION_PATTERN),
+            ("close_mention", CLOSE_MENTION_PATTERN),
+            ("word", word_pattern),
+            ("sentence_end", SENTENCE_END_PATTERN),
+            ("any_char", ANY_CHAR_PATTERN),
+        ]
+
+        def combine(names):
+            return re.compile(
+                "|".join(
+                    "(?P<%s>%s)" % (name, pattern.pattern)
+                    for name, pattern in alternatives
+                    if name in names
+                ),
+                re.I,
+            )
+
+        names = [name for name, _ in alternatives]
+        return combine(names), combine([n for n in names if n != "sentence_end"])
+
     def __init__(self, fpath, tokenization_mode=WORD_TOKENIZATION):
         self.tokenization_mode = tokenization_mode
         self.fpath = fpath
@@ -102,43 +153,42 @@ class SacrParser:
         chains = dict()
         open_mention_counter = 0
         # patterns:
-        additional_tokens_pattern = re.compile(r"#additional_?token:\s*(.+)\s*\n\n+")
-        text_id_pattern = re.compile(r"#text_?id:\s*(.+)\s*\n\n*")
-        comment_pattern = re.compile(r"(?:#(.*)\n+|\*{5,})")
-        end_par_pattern = re.compile(r"\n\n+")
-        space_pattern = re.compile(r"\s+")
-        new_line_pattern = re.compile(r"\n")
-        open_mention_pattern = re.compile(r"\{(\w+)(:| )")
-        feature_pattern = re.compile(r'(\w+)=(?:(\w+)|"([^"]*)")(,| )')
-        close_mention_pattern = re.compile(r"\}")
-        sentence_end_pattern = re.compile(r'(?:\.+"?|\!|\?)')
+        additional_tokens_pattern = ADDITIONAL_TOKENS_PATTERN
+        text_id_pattern = TEXT_ID_PATTERN
+        comment_pattern = COMMENT_PATTERN
+        space_pattern = SPACE_PATTERN
+        feature_pattern = FEATURE_PATTERN
         if self.tokenization_mode == WORD_TOKENIZATION:
-            word_pattern = self.__class__.get_word_regex(additional_tokens)
+            word_pattern = self.__class__.get_word_regex(tuple(additional_tokens))
         else:
-            word_pattern = re.compile(r".")
+            word_pattern = ANY_CHAR_PATTERN
+        paragraph_pattern, mention_pattern = \
+            SacrParser.get_paragraph_regexes(word_pattern)
         # eat leading blank lines
-        m = re.compile(r"\s+").match(content, pos)
+        m = space_pattern.match(content, pos)
         if m:
             # print('eat leading spaces')
-            pos += len(m.group(0))
+            pos = m.end()
         while pos < len(content):
             m = additional_tokens_pattern.match(content, pos)
             if m:
                 # print('add word')
-                pos += len(m.group(0))
+                pos = m.end()
                 additional_tokens.append(m.group(1))
-                word_pattern = SacrParser.get_word_regex(additional_tokens)
+                word_pattern = SacrParser.get_word_regex(tuple(additional_tokens))
+                paragraph_pattern, mention_pattern = \
+                    SacrParser.get_paragraph_regexes(word_pattern)
                 continue
             m = text_id_pattern.match(content, pos)
             if m:
                 # print('textid')
-                pos += len(m.group(0))
+                pos = m.end()
                 yield "text_id", m.group(1)
                 continue
             m = comment_pattern.match(content, pos)
             if m:
                 # print('comment', m.group(0))
-                pos += len(m.group(0))
+                pos = m.end()
                 comment = m.group(1).strip()
                 if comment:
                     yield "comment", comment
@@ -146,75 +196,55 @@ class SacrParser:
             # paragraph of text
             yield "par_start", None
             while pos < len(content):
-                # print("%d, %d" % (pos, len(content)))
-                # print(content[pos])
-                m = end_par_pattern.match(content, pos)
-                if m:
-                    # print('end par')
-                    pos += len(m.group(0))
+                # sentence ends are only looked for outside of mentions
+                if open_mention_counter == 0:
+                    m = paragraph_pattern.match(content, pos)
+                else:
+                    m = mention_pattern.match(content, pos)
+                kind = m.lastgroup
+                if kind in ("word", "any_char"):
+                    pos = m.end()
+                    yield "token", m.group()
+                elif kind in ("space", "new_line"):
+                    pos = m.end()
+                elif kind == "end_par":
+                    pos = m.end()
                     yield "par_end", None
                     break
-                m = space_pattern.match(content, pos)
-                if m:
-                    # print('space')
-                    pos += len(m.group(0))
-                    continue
-                m = new_line_pattern.match(content, pos)
-                if m:
-                    # print('newline')
-                    pos += len(m.group(0))
-                    continue
-                m = open_mention_pattern.match(content, pos)
-                if m:
-                    # print('mention')
-                    pos += len(m.group(0))
+                elif kind == "open_mention":
+                    pos = m.end()
                     open_mention_counter += 1
-                    if m.group(1) not in chains:
-                        chains[m.group(1)] = len(chains)
-                    chain_index = chains[m.group(1)]
-                    chain_name = m.group(1)
+                    chain_name = m.group("chain_name")
+                    chain_index = chains.get(chain_name)
+                    if chain_index is None:
+                        chain_index = chains[chain_name] = len(chains)
                     features = dict()
-                    if m.group(2) == ":":
-                        while pos < len(content):
-                            m = feature_pattern.match(content, pos)
-                            if m:
-                                key = m.group(1)
-                                value = m.group(2) if m.group(2) is not None else m.group(3)
-                                features[key] = value
-                                pos += len(m.group(0))
-                                if m.group(4) == " ":
-                                    break
-                            else:
-                                raise SyntaxError(
-                                    "can't understand '%s' near %d" % (content, pos)
-                                )
+                    if m.group("open_mention_sep") == ":":
+                        # the features must follow each other, up to the
+                        # one followed by a space
+                        closed = False
+                        for m in feature_pattern.finditer(content, pos):
+                            if m.start() != pos:
+                                break
+                            key = m.group(1)
+                            value = m.group(2) if m.group(2) is not None else m.group(3)
+                            features[key] = value
+                            pos = m.end()
+                            if m.group(4) == " ":
+                                closed = True
+                                break
+                        if not closed and pos < len(content):
+                            raise SyntaxError(
+                                "can't understand '%s' near %d" % (content, pos)
+                            )
                     yield "mention_start", (chain_index, chain_name, features)
-                    continue
-                m = close_mention_pattern.match(content, pos)
-                if m:
-                    # print('end mention')
-                    pos += len(m.group(0))
+                elif kind == "close_mention":
+                    pos = m.end()
                     open_mention_counter -= 1
                     yield "mention_end", None
-                    continue
-                m = word_pattern.match(content, pos)
-                if m:
-                    # print('token: %s' % m.group(0))
-                    pos += len(m.group(0))
-                    yield "token", m.group(0)
-                    continue
-                if open_mention_counter == 0:
-                    m = sentence_end_pattern.match(content, pos)
-                    if m:
-                        # print('token: %s' % m.group(0))
-                        pos += len(m.group(0))
-                        yield "token", m.group(0)
-                        yield "sentence_change", None
-                        continue
-                m = re.compile(r".").match(content, pos)
-                if m:
-                    # print('token: %s' % m.group(0))
-                    pos += len(m.group(0))
-                    yield "token", m.group(0)
-                    continue
-                assert False
+                elif kind == "sentence_end":
+                    pos = m.end()
+                    yield "token", m.group()
+                    yield "sentence_change", None
+                else:
+                    assert False
@@ -1,47 +1,55 @@
 from __future__ import annotations
 
+import locale
+import mmap
 import re
 from dataclasses import dataclass
 from pathlib import Path
+from sys import intern
 from typing import Generator
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Token:
     start: int
     end: int
 
     def __eq__(self, other: Token) -> bool:
-        return self.start == other.start and self.end == other.end
+        # like the generated `__eq__`, tokens of different types are different
+        return (
+            type(self) is type(other)
+            and self.start == other.start
+            and self.end == other.end
+        )
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class TextID(Token):
     text_id: str
 
     def __eq__(self, other: TextID) -> bool:
-        return super().__eq__(other) and self.text_id == other.text_id
+        return Token.__eq__(self, other) and self.text_id == other.text_id
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Comment(Token):
     value: str
 
     def __eq__(self, other: Comment) -> bool:
-        return super().__eq__(other) and self.value == other.value
+        return Token.__eq__(self, other) and self.value == other.value
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ParagraphStart(Token):
     ...
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ParagraphEnd(Token):
     ...
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class MentionStart(Token):
     chain_index: int
     chain_name: str
@@ -49,47 +57,61 @@ class MentionStart(Token):
 
     def __eq__(self, other: MentionStart) -> bool:
         return (
-            super().__eq__(other)
+            Token.__eq__(self, other)
             and self.chain_index == other.chain_index
             and self.chain_name == other.chain_name
             and self.features == other.features
         )
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class MentionEnd(Token):
     ...
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Spaces(Token):
     value: str
 
     def __eq__(self, other: Spaces) -> bool:
-        return super().__eq__(other) and self.value == other.value
+        return Token.__eq__(self, other) and self.value == other.value
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class NewLineInsideParagraph(Token):
     value: str
 
     def __eq__(self, other: NewLineInsideParagraph) -> bool:
-        return super().__eq__(other) and self.value == other.value
+        return Token.__eq__(self, other) and self.value == other.value
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Word(Token):
     value: str
 
     def __eq__(self, other: Word) -> bool:
-        return super().__eq__(other) and self.value == other.value
+        return Token.__eq__(self, other) and self.value == other.value
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SentenceChange(Token):
     ...
 
 
+ADDITIONAL_TOKENS_PATTERN = re.compile(r"#additional_?token:\s*(.+)\s*\n\n+")
+TEXT_ID_PATTERN = re.compile(r"#text_?id:\s*(.+)\s*\n\n*")
+COMMENT_PATTERN = re.compile(r"(?:#(.*)(?:\n+|$)|\*{5,})")
+END_PAR_PATTERN = re.compile(r"\n\n+")
+SPACE_PATTERN = re.compile(r"\s+")
+NEW_LINE_PATTERN = re.compile(r"\n")
+OPEN_MENTION_PATTERN = re.compile(r"\{(?P<chain_name>\w+)(?P<open_mention_sep>:| )")
+FEATURE_PATTERN = re.compile(r'(\w+)=(?:(\w+)|"([^"]*)")(,| )')
+FEATURES_PATTERN = re.compile(r'(?:\w+=(?:\w+|"[^"]*"),)*\w+=(?:\w+|"[^"]*") ')
+CLOSE_MENTION_PATTERN = re.compile(r"\}")
+SENTENCE_END_PATTERN = re.compile(r'(?:\.+"?|\!|\?)')
+ANY_CHAR_PATTERN = re.compile(r".")
+
+
 def escape_regex(string: str) -> str:
     """Escape a string so it can be literally searched for in a regex.
 
@@ -98,6 +120,22 @@ def escape_regex(string: str) -> str:
     return re.sub(r"([-{}\[\]().])", r"\\\1", string)
 
 
+def read_file(path: Path) -> str:
+    """Read a file like `Path.read_text`, but decode it directly from a
+    read-only memory map, without the intermediate copy of the bytes.
+
+    Newlines are translated as in text mode, so offsets are the same.
+    """
+    with path.open("rb") as fh:
+        if not path.stat().st_size:
+            return ""
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            content = str(mm, locale.getpreferredencoding(False))
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+
 class SacrParser:
     """Parse a file in the SACR format."""
 
@@ -105,7 +143,7 @@ class SacrParser:
         if isinstance(source, str):
             self.content = source
         else:
-            self.content = source.read_text()
+            self.content = read_file(source)
 
     @staticmethod
     def get_word_pattern(additional_tokens: list[str] | None = None) -> re.Pattern[str]:
@@ -123,51 +161,85 @@ class SacrParser:
         else:
             return re.compile("(%s)" % token_str, re.IGNORECASE)
 
+    @staticmethod
+    def get_paragraph_patterns(
+        word_pattern: re.Pattern[str],
+    ) -> tuple[re.Pattern[str], re.Pattern[str]]:
+        """Combine everything that can be found inside a paragraph into one
+        regex, so that each element is found with a single match.
+
+        The alternatives are tried in order.  The first pattern is used
+        outside of mentions, the second one inside mentions (no sentence ends).
+        """
+        alternatives = [
+            ("end_par", END_PAR_PATTERN),
+            ("new_line", NEW_LINE_PATTERN),
+            ("space", SPACE_PATTERN),
+            ("open_mention", OPEN_MENTION_PATTERN),
+            ("close_mention", CLOSE_MENTION_PATTERN),
+            ("word", word_pattern),
+            ("sentence_end", SENTENCE_END_PATTERN),
+            ("any_char", ANY_CHAR_PATTERN),
+        ]
+
+        def combine(names: list[str]) -> re.Pattern[str]:
+            return re.compile(
+                "|".join(
+                    "(?P<%s>%s)" % (name, pattern.pattern)
+                    for name, pattern in alternatives
+                    if name in names
+                ),
+                re.IGNORECASE,
+            )
+
+        names = [name for name, _ in alternatives]
+        return combine(names), combine([n for n in names if n != "sentence_end"])
+
     def parse(self) -> Generator[Token, None, None]:
         """Parse the file and yields elements."""
         content = self.content
         additional_tokens: list[str] = []
         pos = 0
         chains: dict[str, int] = dict()
+        # features as written in the file -> parsed features
+        features_cache: dict[str, dict[str, str]] = dict()
         open_mention_counter = 0
 
         # patterns
-        additional_tokens_pattern = re.compile(r"#additional_?token:\s*(.+)\s*\n\n+")
-        text_id_pattern = re.compile(r"#text_?id:\s*(.+)\s*\n\n*")
-        comment_pattern = re.compile(r"(?:#(.*)(?:\n+|$)|\*{5,})")
-        end_par_pattern = re.compile(r"\n\n+")
-        space_pattern = re.compile(r"\s+")
-        new_line_pattern = re.compile(r"\n")
-        open_mention_pattern = re.compile(r"\{(\w+)(:| )")
-        feature_pattern = re.compile(r'(\w+)=(?:(\w+)|"([^"]*)")(,| )')
-        close_mention_pattern = re.compile(r"\}")
-        sentence_end_pattern = re.compile(r'(?:\.+"?|\!|\?)')
+        additional_tokens_pattern = ADDITIONAL_TOKENS_PATTERN
+        text_id_pattern = TEXT_ID_PATTERN
+        comment_pattern = COMMENT_PATTERN
+        space_pattern = SPACE_PATTERN
+        feature_pattern = FEATURE_PATTERN
+        features_pattern = FEATURES_PATTERN
         word_pattern = self.get_word_pattern(additional_tokens)
+        paragraph_pattern, mention_pattern = self.get_paragraph_patterns(word_pattern)
 
         # eat leading blank lines
-        if m := re.compile(r"\s+").match(content, pos):
-            pos += len(m.group(0))
+        if m := space_pattern.match(content, pos):
+            pos = m.end()
 
         while pos < len(content):
             if m := additional_tokens_pattern.match(content, pos):
-                pos += len(m.group(0))
+                pos = m.end()
                 additional_tokens.append(m.group(1))
                 word_pattern = SacrParser.get_word_pattern(additional_tokens)
+                paragraph_pattern, mention_pattern = SacrParser.get_paragraph_patterns(
+                    word_pattern
+                )
                 continue
 
             if m := text_id_pattern.match(content, pos):
-                length = len(m.group(0))
-                yield TextID(pos, pos + length, m.group(1))
-                pos += length
+                yield TextID(pos, m.end(), m.group(1))
+                pos = m.end()
                 continue
 
             if m := comment_pattern.match(content, pos):
-                length = len(m.group(0))
                 if m.group(1):  # no group 0 if ******
                     comment = m.group(1).strip()
                     if comment:
-                        yield Comment(pos, pos + length, comment)
-                pos += length
+                        yield Comment(pos, m.end(), comment)
+                pos = m.end()
                 continue
 
             # parsing a paragraph
@@ -175,47 +247,82 @@ class SacrParser:
             yield ParagraphStart(pos, pos)
 
             while pos < len(content):
-                if m := end_par_pattern.match(content, pos):
-                    length = len(m.group(0))
-                    yield ParagraphEnd(pos, pos + length)
-                    pos += length
+                # sentence ends are only looked for outside of mentions
+                if open_mention_counter == 0:
+                    m = paragraph_pattern.match(content, pos)
+                else:
+                    m = mention_pattern.match(content, pos)
+                assert m is not None
+                kind = m.lastgroup
+                end = m.end()
+
+                if kind == "word" or kind == "any_char":
+                    # words repeat a lot: share the strings (long ones are
+                    # mostly unique)
+                    value = m.group()
+                    if end - pos <= 16:
+                        value = intern(value)
+                    yield Word(pos, end, value)
+                    pos = end
+
+                elif kind == "space":
+                    yield Spaces(pos, end, m.group())
+                    pos = end
+
+                elif kind == "new_line":
+                    yield NewLineInsideParagraph(pos, end, m.group())
+                    pos = end
+
+                elif kind == "end_par":
+                    yield ParagraphEnd(pos, end)
+                    pos = end
                     break
 
-                if m := new_line_pattern.match(content, pos):
-                    length = len(m.group(0))
-                    yield NewLineInsideParagraph(pos, pos + length, m.group(0))
-                    pos += length
-                    continue
-
-                if m := space_pattern.match(content, pos):
-                    length = len(m.group(0))
-                    yield Spaces(pos, pos + length, m.group(0))
-                    pos += length
-                    continue
-
-                if m := open_mention_pattern.match(content, pos):
+                elif kind == "open_mention":
                     start = pos
-                    pos += len(m.group(0))
+                    pos = end
                     open_mention_counter += 1
 
-                    if m.group(1) not in chains:
-                        chains[m.group(1)] = len(chains)
-                    chain_index = chains[m.group(1)]
-                    chain_name = m.group(1)
+                    chain_name = intern(m.group("chain_name"))
+                    chain_index = chains.get(chain_name)
+                    if chain_index is None:
+                        chain_index = chains[chain_name] = len(chains)
 
                     features = dict()
-                    if m.group(2) == ":":
-                        while pos < len(content):
-                            if m := feature_pattern.match(content, pos):
-                                key = m.group(1)
+                    if m.group("open_mention_sep") == ":":
+                        if fm := features_pattern.match(content, pos):
+                            # the same features are often repeated (mention types,
+                            # etc.), so they are parsed once
+                            raw = fm.group()
+                            cached = features_cache.get(raw)
+                            if cached is None:
+                                cached = features_cache[raw] = {
+                                    intern(f.group(1)): intern(
+                                        f.group(2)
+                                        if f.group(2) is not None
+                                        else f.group(3)
+                                    )
+                                    for f in feature_pattern.finditer(raw)
+                                }
+                            features.update(cached)
+                            pos = fm.end()
+                        else:
+                            # malformed or unfinished features: the features must
+                            # follow each other, up to the one followed by a space
+                            closed = False
+                            for m in feature_pattern.finditer(content, pos):
+                                if m.start() != pos:
+                                    break
+                                key = intern(m.group(1))
                                 value = (
                                     m.group(2) if m.group(2) is not None else m.group(3)
                                 )
-                                features[key] = value
-                                pos += len(m.group(0))
+                                features[key] = intern(value)
+                                pos = m.end()
                                 if m.group(4) == " ":
+                                    closed = True
                                     break
-                            else:
+                            if not closed and pos < len(content):
                                 raise SyntaxError(
                                     "can't understand '%s' near %d" % (content, pos)
                                 )
@@ -226,32 +333,16 @@ class SacrParser:
                         chain_name=chain_name,
                         features=features,
                     )
-                    continue
 
-                if m := close_mention_pattern.match(content, pos):
-                    length = len(m.group(0))
-                    yield MentionEnd(pos, pos + length)
-                    pos += length
+                elif kind == "close_mention":
+                    yield MentionEnd(pos, end)
+                    pos = end
                     open_mention_counter -= 1
-                    continue
 
-                if m := word_pattern.match(content, pos):
-                    length = len(m.group(0))
-                    yield Word(pos, pos + length, m.group(0))
-                    pos += length
-                    continue
+                elif kind == "sentence_end":
+                    yield Word(pos, end, m.group())
+                    yield SentenceChange(pos, end)
+                    pos = end
 
-                if open_mention_counter == 0:
-                    if m := sentence_end_pattern.match(content, pos):
-                        length = len(m.group(0))
-                        yield Word(pos, pos + length, m.group(0))
-                        yield SentenceChange(pos, pos + length)
-                        pos += length
-                        continue
-
-                if m := re.compile(r".").match(content, pos):
-                    length = len(m.group(0))
-                    yield Word(pos, pos + length, m.group(0))
-                    pos += length
-                    continue
-                assert False
+                else:
+                    assert False
@@ -52,6 +52,8 @@ Version 1.0.0
 
 """
 
+from functools import lru_cache
+from itertools import accumulate
 
 
 class Standoff2Inline:
@@ -99,6 +101,38 @@ class Standoff2Inline:
 
 
 
+    def add_start_end(self, start, end):
+        """Add an annotation with both a `start` and an `end` annotation.
+
+        Same as `add(start, end)`, but both annotations must be given as
+        tuples `(position, string)`: they are not checked nor converted.
+        """
+
+        self._elements.append((start, end))
+        self._sorted = False
+
+
+
+    def add_many(self, annotations):
+        """Add several annotations at once.
+
+        `annotations` is an iterable of `(start, end)` pairs, as given to
+        `add_start_end()`.
+        """
+
+        self._elements.extend(annotations)
+        self._sorted = False
+
+
+
+    def clear(self):
+        """Remove all the annotations, so that the object can be reused."""
+
+        self._elements.clear()
+        self._sorted = False
+
+
+
     def _iter_elements(self, elements):
         if self.kind is None:
             yield from self._get_strings(elements)
@@ -114,14 +148,13 @@ class Standoff2Inline:
     def _get_xml_strings(self, elements):
         for (start, start_val), (end, end_val) in elements:
             if isinstance(start_val, str):
-                tagname, dic = start_val, dict()
+                tagname, dic = start_val, None
             else:
                 tagname, dic = start_val
-            attrs = " ".join('%s="%s"' % (k, v) for k, v in dic.items())
-            if attrs:
-                attrs = " " + attrs
-            start_val = "<%s%s>" % (tagname, attrs)
-            end_val = "</%s>" % tagname
+            start_val, end_val = _get_xml_tags(tagname)
+            if dic:
+                attrs = " ".join('%s="%s"' % (k, v) for k, v in dic.items())
+                start_val = "<%s %s>" % (tagname, attrs)
             yield (start, start_val), (end, end_val)
 
 
@@ -129,12 +162,12 @@ class Standoff2Inline:
     def _get_sacr_strings(self, elements):
         for (start, start_val), (end, end_val) in elements:
             tagname, dic = start_val
-            attrs = " ".join('%s="%s"' % (k, v) for k, v in dic.items())
-            if attrs:
-                attrs = ":" + attrs
-            start_val = "{%s%s " % (tagname, attrs)
-            end_val = "}"
-            yield (start, start_val), (end, end_val)
+            if dic:
+                attrs = " ".join('%s="%s"' % (k, v) for k, v in dic.items())
+                start_val = "{%s:%s " % (tagname, attrs)
+            else:
+                start_val = _get_sacr_tag(tagname)
+            yield (start, start_val), (end, "}")
 
 
 
@@ -154,17 +187,16 @@ class Standoff2Inline:
         token list.
         """
 
-        string = ""
-        t2s = []
-        for i, token in enumerate(tokens):
-            start = len(string)
-            t2s.append((start, start+len(token)-1))
-            string += token + " "
-        elements = []
-        for (start, start_val), (end, end_val) in self._elements:
-            start = t2s[start][0]
-            end = t2s[end][1]
-            elements.append(((start, start_val), (end, end_val)))
+        string = " ".join(tokens) + " "
+        lengths = [len(token) for token in tokens]
+        # each token is followed by a space
+        starts = list(accumulate((l+1 for l in lengths), initial=0))
+        starts.pop() # end of the string
+        ends = [start+l-1 for start, l in zip(starts, lengths)]
+        elements = [
+            ((starts[start], start_val), (ends[end], end_val))
+            for (start, start_val), (end, end_val) in self._elements
+        ]
         return string, elements
 
 
@@ -175,8 +207,31 @@ class Standoff2Inline:
         Specify either a `string` or a list of `tokens`.
         """
 
-        return "".join(
-            x[1] for x in self.iter_result(string=string, tokens=tokens))
+        # same sweep as `iter_result`, but only the strings are kept
+        text, elements = self._prepare(string, tokens, False)
+        parts = []
+        append = parts.append
+        pos = 0
+        filo = []
+        move_one = 0 if self.end_is_stop else 1
+        for (start, start_val), (end, end_val) in self._iter_elements(elements):
+            while filo and filo[-1][0] < start:
+                _, stop, suffix = filo.pop()
+                append(text[pos:stop])
+                pos = stop
+                append(suffix)
+            append(text[pos:start])
+            append(start_val)
+            pos = start
+            if end != -1:
+                filo.append((end, end+move_one, end_val))
+        while filo:
+            _, stop, suffix = filo.pop()
+            append(text[pos:stop])
+            pos = stop
+            append(suffix)
+        append(text[pos:])
+        return "".join(parts)
 
 
 
@@ -188,52 +243,87 @@ class Standoff2Inline:
         a chunk of text.
         """
 
-        assert string or tokens and not (string and tokens)
-        def yield_(k, v):
-            if len(v):
-                yield k, v
-        if not self._sorted:
-            self._elements.sort(key=lambda e: e[1][0], reverse=True)
-            self._elements.sort(key=lambda e: e[0][0])
-            self._sorted = True
-        if tokens and not return_tokens:
-            string, elements = self._tokens2string(tokens)
-        else:
-            elements = self._elements
-        res = ""
+        text, elements = self._prepare(string, tokens, return_tokens)
         pos = 0
         filo = []
         move_one = 0 if self.end_is_stop else 1
-        for (start, start_val), end_data in self._iter_elements(elements):
+        for (start, start_val), (end, end_val) in self._iter_elements(elements):
             while filo and filo[-1][0] < start:
-                end, end_val = filo.pop()
-                if tokens and return_tokens:
-                    yield from yield_('string', tokens[pos:end+move_one])
-                else:
-                    yield from yield_('string', string[pos:end+move_one])
-                pos = end + move_one
-                yield 'suffix', end_val
-            if tokens and return_tokens:
-                yield from yield_('string', tokens[pos:start])
-            else:
-                yield from yield_('string', string[pos:start])
+                _, stop, suffix = filo.pop()
+                chunk = text[pos:stop]
+                if len(chunk):
+                    yield 'string', chunk
+                pos = stop
+                yield 'suffix', suffix
+            chunk = text[pos:start]
+            if len(chunk):
+                yield 'string', chunk
             yield 'prefix', start_val
             pos = start
-            if end_data[0] != -1:
-                filo.append(end_data)
+            if end != -1:
+                # (end, position after the end, suffix)
+                filo.append((end, end+move_one, end_val))
         while filo:
-            end, end_val = filo.pop()
-            if tokens and return_tokens:
-                yield from yield_('string', tokens[pos:end+move_one])
-            else:
-                yield from yield_('string', string[pos:end+move_one])
-            pos = end + move_one
-            yield from yield_('suffix', end_val)
-        if tokens and return_tokens:
-            yield from yield_('string', tokens[pos:])
+            _, stop, suffix = filo.pop()
+            chunk = text[pos:stop]
+            if len(chunk):
+                yield 'string', chunk
+            pos = stop
+            if len(suffix):
+                yield 'suffix', suffix
+        chunk = text[pos:]
+        if len(chunk):
+            yield 'string', chunk
+
+
+
+    def _prepare(self, string, tokens, return_tokens):
+        """Return the text to slice (the `string` or the `tokens`) and the
+        elements sorted by position in this text.
+        """
+
+        assert string or tokens and not (string and tokens)
+        if not self._sorted:
+            # by start, then by decreasing end (outer annotations first)
+            self._elements.sort(key=lambda e: (e[0][0], -e[1][0]))
+            self._sorted = True
+        if tokens and not return_tokens:
+            string, elements = self._tokens2string(tokens)
         else:
-            yield from yield_('string', string[pos:])
-        return res
+            elements = self._elements
+        return (tokens if tokens and return_tokens else string), elements
+
+
+
+# the tags without attributes are the same for all the annotations with the
+# same name (eg all the mentions of a chain)
+
+@lru_cache(maxsize=1024)
+def _get_xml_tags(tagname):
+    return "<%s>" % tagname, "</%s>" % tagname
+
+
+
+@lru_cache(maxsize=1024)
+def _get_sacr_tag(tagname):
+    return "{%s " % tagname
+
+
+
+@lru_cache(maxsize=None)
+def _get_css(underline, bold, italic, color):
+    """Return the css style for `Highlighter.set_style` (cached, since the
+    same few styles are used for all the highlighters)."""
+    parts = []
+    if underline:
+        parts.append("text-decoration: underline; ")
+    if bold:
+        parts.append("font-weight: bold; ")
+    if italic:
+        parts.append("font-style: italic; ")
+    if color is not None:
+        parts.append("color: %s; " % color)
+    return "".join(parts)
 
 
 
@@ -257,15 +347,7 @@ class Highlighter:
 
     def set_style(self, underline=False, bold=False, italic=False,
             color=None):
-        res = ""
-        if underline:
-            res += "text-decoration: underline; "
-        if bold:
-            res += "font-weight: bold; "
-        if italic:
-            res += "font-style: italic; "
-        if color is not None:
-            res += "color: %s; " % color
+        res = _get_css(underline, bold, italic, color)
         if res:
             self.prefix = '<span style="%s">%s' % (
                 res, self.prefix if self.prefix else "")
@@ -286,17 +368,25 @@ class Highlighter:
 
 
 
+def _get_affix_getters(hl):
+    """Return two functions giving the prefix and the suffix of the i-th mark
+    of the highlighter `hl`, whether they are lists or single values."""
+    def getter(affix):
+        if isinstance(affix, list):
+            return affix.__getitem__
+        return lambda i: affix
+    return getter(hl.prefix), getter(hl.suffix)
+
+
+
 def highlight_characters(text, *highlighters, end_is_stop=False):
     inliner = Standoff2Inline(end_is_stop=end_is_stop)
     for hl in highlighters:
-        for i in range(len(hl.marks)):
-            start, end = hl.marks[i]
-            prefix = hl.prefix[i] if isinstance(hl.prefix, list) else hl.prefix
-            suffix = hl.suffix[i] if isinstance(hl.suffix, list) else hl.suffix
-            inliner.add(
-                (start, prefix),
-                (end, suffix),
-            )
+        get_prefix, get_suffix = _get_affix_getters(hl)
+        inliner.add_many(
+            ((start, get_prefix(i)), (end, get_suffix(i)))
+            for i, (start, end) in enumerate(hl.marks)
+        )
     return inliner.apply(text)
 
 
@@ -305,14 +395,11 @@ def highlight(text, *highlighters, margin=0, max_gap=0, ellipsis=" [...] ",
         char=False, end_is_stop=False):
     inliner = Standoff2Inline(end_is_stop=end_is_stop)
     for hl in highlighters:
-        for i in range(len(hl.marks)):
-            start, end = hl.marks[i]
-            prefix = hl.prefix[i] if isinstance(hl.prefix, list) else hl.prefix
-            suffix = hl.suffix[i] if isinstance(hl.suffix, list) else hl.suffix
-            inliner.add(
-                (start, prefix),
-                (end, suffix),
-            )
+        get_prefix, get_suffix = _get_affix_getters(hl)
+        inliner.add_many(
+            ((start, get_prefix(i)), (end, get_suffix(i)))
+            for i, (start, end) in enumerate(hl.marks)
+        )
     #return inliner.apply(tokens=text)
     chunks = [
         [a, b] for a, b in inliner.iter_result(
@@ -341,20 +428,21 @@ def highlight(text, *highlighters, margin=0, max_gap=0, ellipsis=" [...] ",
                 if len(string) > max_gap:
                     chunks[i][1] = chunks[i][1][:margin] \
                         + [ellipsis] + chunks[i][1][-1*margin:]
-    res = ""
+    parts = []
+    append = parts.append
     need_space = False
     for kind, chunk in chunks:
         if kind == "string":
             if need_space and not char:
-                res += " "
-            res += chunk if char else " ".join(chunk)
+                append(" ")
+            append(chunk if char else " ".join(chunk))
             need_space = True
         else:
             if kind == "prefix" and need_space and not char:
-                res += " "
+                append(" ")
                 need_space = False
-            res += chunk
-    return res.rstrip()
+            append(chunk)
+    return "".join(parts).rstrip()
 
 
 
@@ -1,12 +1,17 @@
+import copy
+import pickle
+from pathlib import Path
+from typing import Any
 from zipfile import ZipFile
 
+import pandas as pd  # type: ignore
 import pytest
 
 from annotable import Corpus, EmptyDataSet, Mention, Paragraph, Sentence, Text, Token
 
 
-@pytest.fixture
-def corpus1() -> Corpus:
+@pytest.fixture(scope="session")
+def _corpus1_cached() -> Corpus:
     # fmt: off
     corpus = Corpus(
         _texts=[
@@ -74,138 +79,103 @@ def corpus1() -> Corpus:
     )
     # fmt: on
 
+    tokens_by_value = {token.value: token for token in corpus.tokens}
+    assert len(tokens_by_value) == corpus.token_count
+
     def get_tokens(*strings: str) -> list[Token]:
-        rv: list[Token] = []
-        for string in strings:
-            for token in corpus.tokens:
-                if token.value == string:
-                    rv.append(token)
-        assert len(rv) == len(strings)
-        return rv
-
-    corpus._texts[0]._paragraphs[0]._sentences[0].add_mention(
-        Mention("c1", "ab", get_tokens("ab"))
-    )
-    corpus._texts[0]._paragraphs[0]._sentences[0].add_mention(
-        Mention("c2", "ef", get_tokens("ef"))
-    )
-    corpus._texts[0]._paragraphs[0]._sentences[1].add_mention(
-        Mention("c1", "gh", get_tokens("gh"))
-    )
-    corpus._texts[0]._paragraphs[2]._sentences[0].add_mention(
-        Mention("c3", "mn op", get_tokens("mn", "op"))
-    )
-    corpus._texts[0]._paragraphs[2]._sentences[1].add_mention(
-        Mention("c1", "st", get_tokens("st"), features=dict(a=1, b=2, c=3))
-    )
-    corpus._texts[0]._paragraphs[3]._sentences[0].add_mention(
-        Mention("c2", "yz", get_tokens("yz"))
-    )
+        return [tokens_by_value[string] for string in strings]
 
-    corpus._texts[1]._paragraphs[0]._sentences[0].add_mention(
-        Mention("c1", "AB", get_tokens("AB"))
-    )
-    corpus._texts[1]._paragraphs[0]._sentences[0].add_mention(
-        Mention("c2", "EF GH", get_tokens("EF", "GH"), features=dict(A=1, B=2, C=3))
+    # sentences[text][paragraph][sentence]
+    sentences = [
+        [paragraph._sentences for paragraph in text._paragraphs]
+        for text in corpus._texts
+    ]
+    sentences[0][0][0].add_mention(Mention("c1", "ab", get_tokens("ab")))
+    sentences[0][0][0].add_mention(Mention("c2", "ef", get_tokens("ef")))
+    sentences[0][0][1].add_mention(Mention("c1", "gh", get_tokens("gh")))
+    sentences[0][2][0].add_mention(Mention("c3", "mn op", get_tokens("mn", "op")))
+    sentences[0][2][1].add_mention(
+        Mention("c1", "st", get_tokens("st"), features={"a": 1, "b": 2, "c": 3})
     )
-    corpus._texts[1]._paragraphs[1]._sentences[0].add_mention(
-        Mention("c2", "QR", get_tokens("QR"))
+    sentences[0][3][0].add_mention(Mention("c2", "yz", get_tokens("yz")))
+
+    sentences[1][0][0].add_mention(Mention("c1", "AB", get_tokens("AB")))
+    sentences[1][0][0].add_mention(
+        Mention(
+            "c2", "EF GH", get_tokens("EF", "GH"), features={"A": 1, "B": 2, "C": 3}
+        )
     )
+    sentences[1][1][0].add_mention(Mention("c2", "QR", get_tokens("QR")))
 
     return corpus
 
 
+@pytest.fixture
+def corpus1(_corpus1_cached: Corpus, request: pytest.FixtureRequest) -> Corpus:
+    """The corpus is built once: tests that modify it get their own copy."""
+    if request.node.get_closest_marker("mutates_corpus"):
+        return copy.deepcopy(_corpus1_cached)
+    return _corpus1_cached
+
+
+def column(rows: list[dict[str, Any]], key: str) -> list[Any]:
+    return [row[key] for row in rows]
+
+
 def test_iter_paragraphs_as_dict_indices(corpus1: Corpus) -> None:
     actual = list(corpus1.iter_paragraphs_as_dict())
-    expected = [0, 1, 2, 3, 0, 1]
-    assert len(actual) == len(expected)
-    for i, exp in enumerate(expected):
-        assert actual[i]["index_of_paragraph_in_the_text"] == exp
+    assert column(actual, "index_of_paragraph_in_the_text") == [0, 1, 2, 3, 0, 1]
 
 
 def test_iter_sentences_as_dict_indices(corpus1: Corpus) -> None:
     actual = list(corpus1.iter_sentences_as_dict())
-    expected = [
-        [0, 0, 1, 2, 2, 3, 0, 0, 1],
-        [0, 1, 0, 0, 1, 0, 0, 1, 0],
-        [0, 1, 2, 3, 4, 5, 0, 1, 2],
-    ]
-    for i in range(len(expected)):
-        assert len(actual) == len(expected[i])
-    for i, (par_in_text, sent_in_par, sent_in_text) in enumerate(zip(*expected)):
-        assert actual[i]["index_of_paragraph_in_the_text"] == par_in_text
-        assert actual[i]["index_of_sentence_in_the_paragraph"] == sent_in_par
-        assert actual[i]["index_of_sentence_in_the_text"] == sent_in_text
+    expected = {
+        "index_of_paragraph_in_the_text": [0, 0, 1, 2, 2, 3, 0, 0, 1],
+        "index_of_sentence_in_the_paragraph": [0, 1, 0, 0, 1, 0, 0, 1, 0],
+        "index_of_sentence_in_the_text": [0, 1, 2, 3, 4, 5, 0, 1, 2],
+    }
+    for key, values in expected.items():
+        assert column(actual, key) == values
 
 
 def test_iter_tokens_as_dict_indices(corpus1: Corpus) -> None:
     actual = list(corpus1.iter_tokens_as_dict())
-    expected = [
-        [0, 0, 0, 0, 1, 1, 2, 2, 2, 2, 2, 3, 3, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1],
-        [0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 0, 0],
-        [0, 0, 0, 1, 2, 2, 3, 3, 3, 4, 4, 5, 5, 0, 0, 0, 0, 1, 1, 2, 2, 2, 2, 2],
-        [0, 1, 2, 0, 0, 1, 0, 1, 2, 0, 1, 0, 1, 0, 1, 2, 3, 0, 1, 0, 1, 2, 3, 4],
-        [0, 1, 2, 3, 0, 1, 0, 1, 2, 3, 4, 0, 1, 0, 1, 2, 3, 4, 5, 0, 1, 2, 3, 4],
-        [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
-    ]
-    for i in range(len(expected)):
-        assert len(actual) == len(expected[i])
-    for i, (
-        par_in_text,
-        sent_in_par,
-        sent_in_text,
-        token_in_sent,
-        token_in_par,
-        token_in_text,
-    ) in enumerate(zip(*expected)):
-        assert actual[i]["index_of_paragraph_in_the_text"] == par_in_text
-        assert actual[i]["index_of_sentence_in_the_paragraph"] == sent_in_par
-        assert actual[i]["index_of_sentence_in_the_text"] == sent_in_text
-        assert actual[i]["index_of_token_in_the_sentence"] == token_in_sent
-        assert actual[i]["index_of_token_in_the_paragraph"] == token_in_par
-        assert actual[i]["index_of_token_in_the_text"] == token_in_text
+    # fmt: off
+    expected = {
+        "index_of_paragraph_in_the_text": [0, 0, 0, 0, 1, 1, 2, 2, 2, 2, 2, 3, 3, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1],
+        "index_of_sentence_in_the_paragraph": [0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 0, 0],
+        "index_of_sentence_in_the_text": [0, 0, 0, 1, 2, 2, 3, 3, 3, 4, 4, 5, 5, 0, 0, 0, 0, 1, 1, 2, 2, 2, 2, 2],
+        "index_of_token_in_the_sentence": [0, 1, 2, 0, 0, 1, 0, 1, 2, 0, 1, 0, 1, 0, 1, 2, 3, 0, 1, 0, 1, 2, 3, 4],
+        "index_of_token_in_the_paragraph": [0, 1, 2, 3, 0, 1, 0, 1, 2, 3, 4, 0, 1, 0, 1, 2, 3, 4, 5, 0, 1, 2, 3, 4],
+        "index_of_token_in_the_text": [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
+    }
+    # fmt: on
+    for key, values in expected.items():
+        assert column(actual, key) == values
 
 
 def test_iter_text_mentions_as_dict_indices(corpus1: Corpus) -> None:
     actual = list(corpus1.iter_text_mentions_as_dict())
-    expected = [
-        [0, 0, 2, 0, 3, 2, 0, 0, 1],
-        [0, 1, 1, 0, 0, 0, 0, 0, 0],
-        [0, 1, 4, 0, 5, 3, 0, 0, 2],
-        [0, 0, 0, 1, 0, 0, 0, 1, 0],
-        [0, 2, 1, 1, 0, 0, 0, 1, 0],
-        [0, 2, 4, 1, 5, 3, 0, 1, 2],
-        [0, 1, 2, 0, 1, 0, 0, 0, 1],
-    ]
-    for i in range(len(expected)):
-        assert len(actual) == len(expected[i])
-    for i, (
-        par_in_text,
-        sent_in_par,
-        sent_in_text,
-        mention_in_sent,
-        mention_in_par,
-        mention_in_text,
-        mention_in_chain,
-    ) in enumerate(zip(*expected)):
-        assert actual[i]["index_of_paragraph_in_the_text"] == par_in_text
-        assert actual[i]["index_of_sentence_in_the_paragraph"] == sent_in_par
-        assert actual[i]["index_of_sentence_in_the_text"] == sent_in_text
-        assert actual[i]["index_of_mention_in_the_sentence"] == mention_in_sent
-        assert actual[i]["index_of_mention_in_the_paragraph"] == mention_in_par
-        assert actual[i]["index_of_mention_in_the_text"] == mention_in_text
-        assert actual[i]["index_of_mention_in_the_chain"] == mention_in_chain
+    expected = {
+        "index_of_paragraph_in_the_text": [0, 0, 2, 0, 3, 2, 0, 0, 1],
+        "index_of_sentence_in_the_paragraph": [0, 1, 1, 0, 0, 0, 0, 0, 0],
+        "index_of_sentence_in_the_text": [0, 1, 4, 0, 5, 3, 0, 0, 2],
+        "index_of_mention_in_the_sentence": [0, 0, 0, 1, 0, 0, 0, 1, 0],
+        "index_of_mention_in_the_paragraph": [0, 2, 1, 1, 0, 0, 0, 1, 0],
+        "index_of_mention_in_the_text": [0, 2, 4, 1, 5, 3, 0, 1, 2],
+        "index_of_mention_in_the_chain": [0, 1, 2, 0, 1, 0, 0, 0, 1],
+    }
+    for key, values in expected.items():
+        assert column(actual, key) == values
 
 
 def test_iter_text_chains_as_dict_indices(corpus1: Corpus) -> None:
     actual = list(corpus1.iter_text_chains_as_dict())
-    expected = [
-        [0, 1, 2, 0, 1],
-    ]
-    for i in range(len(expected)):
-        assert len(actual) == len(expected[i])
-    for i, (chain_in_text,) in enumerate(zip(*expected)):
-        assert actual[i]["index_of_chain_in_the_text"] == chain_in_text
+    expected = {
+        "index_of_chain_in_the_text": [0, 1, 2, 0, 1],
+    }
+    for key, values in expected.items():
+        assert column(actual, key) == values
 
 
 def test_iter_texts_as_dict_counts(corpus1: Corpus) -> None:
@@ -225,35 +195,32 @@ def test_iter_texts_as_dict_counts(corpus1: Corpus) -> None:
 
 def test_iter_paragraphs_as_dict_counts(corpus1: Corpus) -> None:
     actual = list(corpus1.iter_paragraphs_as_dict())
-    expected = [
-        [4, 2, 5, 2, 6, 5],
-        [2, 1, 2, 1, 2, 1],
-        [3, 0, 2, 1, 2, 1],
-    ]
-    for i, (token_count, sentence_count, mention_count) in enumerate(zip(*expected)):
-        assert actual[i]["token_count"] == token_count
-        assert actual[i]["sentence_count"] == sentence_count
-        assert actual[i]["mention_count"] == mention_count
+    expected = {
+        "token_count": [4, 2, 5, 2, 6, 5],
+        "sentence_count": [2, 1, 2, 1, 2, 1],
+        "mention_count": [3, 0, 2, 1, 2, 1],
+    }
+    for key, values in expected.items():
+        assert column(actual, key) == values
 
 
 def test_iter_sentences_as_dict_counts(corpus1: Corpus) -> None:
     actual = list(corpus1.iter_sentences_as_dict())
-    expected = [
-        [3, 1, 2, 3, 2, 2, 4, 2, 5],
-        [2, 1, 0, 1, 1, 1, 2, 0, 1],
-    ]
-    for i, (token_count, mention_count) in enumerate(zip(*expected)):
-        assert actual[i]["token_count"] == token_count
-        assert actual[i]["mention_count"] == mention_count
+    expected = {
+        "token_count": [3, 1, 2, 3, 2, 2, 4, 2, 5],
+        "mention_count": [2, 1, 0, 1, 1, 1, 2, 0, 1],
+    }
+    for key, values in expected.items():
+        assert column(actual, key) == values
 
 
 def test_iter_text_mentions_as_dict_counts(corpus1: Corpus) -> None:
     actual = list(corpus1.iter_text_mentions_as_dict())
-    expected = [
-        [1, 1, 1, 1, 1, 2, 1, 2, 1],
-    ]
-    for i, (token_count,) in enumerate(zip(*expected)):
-        assert actual[i]["token_count"] == token_count
+    expected = {
+        "token_count": [1, 1, 1, 1, 1, 2, 1, 2, 1],
+    }
+    for key, values in expected.items():
+        assert column(actual, key) == values
 
 
 def test_iter_texts_as_dict_ids_and_names(corpus1: Corpus) -> None:
@@ -266,234 +233,133 @@ def test_iter_texts_as_dict_ids_and_names(corpus1: Corpus) -> None:
 
 def test_iter_paragraphs_as_dict_ids_and_names(corpus1: Corpus) -> None:
     actual = list(corpus1.iter_paragraphs_as_dict())
-    expected = [
-        [0] * 4 + [1] * 2,
-        [None] * 4 + ["my text"] * 2,
-    ]
-    for i, (text_id, text_name) in enumerate(zip(*expected)):  # type: ignore
-        assert actual[i]["id"] == i
-        assert actual[i]["text_id"] == text_id
-        assert actual[i]["text_name"] == text_name
+    assert column(actual, "id") == list(range(len(actual)))
+    expected = {
+        "text_id": [0] * 4 + [1] * 2,
+        "text_name": [None] * 4 + ["my text"] * 2,
+    }
+    for key, values in expected.items():
+        assert column(actual, key) == values
 
 
 def test_iter_sentences_as_dict_ids_and_names(corpus1: Corpus) -> None:
     actual = list(corpus1.iter_sentences_as_dict())
-    expected = [
-        [0, 0, 1, 2, 2, 3, 4, 4, 5],
-        [0] * 6 + [1] * 3,
-        [None] * 6 + ["my text"] * 3,
-    ]
-    for i, (paragraph_id, text_id, text_name) in enumerate(zip(*expected)):  # type: ignore
-        assert actual[i]["id"] == i
-        assert actual[i]["paragraph_id"] == paragraph_id
-        assert actual[i]["text_id"] == text_id
-        assert actual[i]["text_name"] == text_name
+    assert column(actual, "id") == list(range(len(actual)))
+    expected = {
+        "paragraph_id": [0, 0, 1, 2, 2, 3, 4, 4, 5],
+        "text_id": [0] * 6 + [1] * 3,
+        "text_name": [None] * 6 + ["my text"] * 3,
+    }
+    for key, values in expected.items():
+        assert column(actual, key) == values
 
 
 def test_iter_tokens_as_dict_ids_and_names(corpus1: Corpus) -> None:
     actual = list(corpus1.iter_tokens_as_dict())
-    expected = [
-        [0, 0, 0, 1, 2, 2, 3, 3, 3, 4, 4, 5, 5, 6, 6, 6, 6, 7, 7, 8, 8, 8, 8, 8],
-        [0, 0, 0, 0, 1, 1, 2, 2, 2, 2, 2, 3, 3, 4, 4, 4, 4, 4, 4, 5, 5, 5, 5, 5],
-        [0] * 13 + [1] * 11,
-        [None] * 13 + ["my text"] * 11,
-    ]
-    for i, (sentence_id, paragraph_id, text_id, text_name) in enumerate(zip(*expected)):  # type: ignore
-        assert actual[i]["id"] == i
-        assert actual[i]["sentence_id"] == sentence_id
-        assert actual[i]["paragraph_id"] == paragraph_id
-        assert actual[i]["text_id"] == text_id
-        assert actual[i]["text_name"] == text_name
+    assert column(actual, "id") == list(range(len(actual)))
+    # fmt: off
+    expected = {
+        "sentence_id": [0, 0, 0, 1, 2, 2, 3, 3, 3, 4, 4, 5, 5, 6, 6, 6, 6, 7, 7, 8, 8, 8, 8, 8],
+        "paragraph_id": [0, 0, 0, 0, 1, 1, 2, 2, 2, 2, 2, 3, 3, 4, 4, 4, 4, 4, 4, 5, 5, 5, 5, 5],
+        "text_id": [0] * 13 + [1] * 11,
+        "text_name": [None] * 13 + ["my text"] * 11,
+    }
+    # fmt: on
+    for key, values in expected.items():
+        assert column(actual, key) == values
 
 
 def test_iter_text_mentions_as_dict_ids_and_names(corpus1: Corpus) -> None:
     actual = list(corpus1.iter_text_mentions_as_dict())
-    expected = [
-        [0, 0, 0, 1, 1, 2, 3, 4, 4],
-        ["c1", "c1", "c1", "c2", "c2", "c3", "c1", "c2", "c2"],
-        [0, 1, 4, 0, 5, 3, 6, 6, 8],
-        [0, 0, 2, 0, 3, 2, 4, 4, 5],
-        [0] * 6 + [1] * 3,
-        [None] * 6 + ["my text"] * 3,
-    ]
-    for i, (chain_id, chain_name, sentence_id, paragraph_id, text_id, text_name) in enumerate(zip(*expected)):  # type: ignore
-        assert actual[i]["id"] == i
-        assert actual[i]["chain_id"] == chain_id
-        assert actual[i]["chain_name"] == chain_name
-        assert actual[i]["sentence_id"] == sentence_id
-        assert actual[i]["paragraph_id"] == paragraph_id
-        assert actual[i]["text_id"] == text_id
-        assert actual[i]["text_name"] == text_name
+    assert column(actual, "id") == list(range(len(actual)))
+    expected = {
+        "chain_id": [0, 0, 0, 1, 1, 2, 3, 4, 4],
+        "chain_name": ["c1", "c1", "c1", "c2", "c2", "c3", "c1", "c2", "c2"],
+        "sentence_id": [0, 1, 4, 0, 5, 3, 6, 6, 8],
+        "paragraph_id": [0, 0, 2, 0, 3, 2, 4, 4, 5],
+        "text_id": [0] * 6 + [1] * 3,
+        "text_name": [None] * 6 + ["my text"] * 3,
+    }
+    for key, values in expected.items():
+        assert column(actual, key) == values
 
 
 def test_iter_text_chains_as_dict_ids_and_names(corpus1: Corpus) -> None:
     actual = list(corpus1.iter_text_chains_as_dict())
-    expected = [
-        [0] * 3 + [1] * 2,
-        [None] * 3 + ["my text"] * 2,
-    ]
-    for i, (text_id, text_name) in enumerate(zip(*expected)):  # type: ignore
-        assert actual[i]["id"] == i
-        assert actual[i]["text_id"] == text_id
-        assert actual[i]["text_name"] == text_name
+    assert column(actual, "id") == list(range(len(actual)))
+    expected = {
+        "text_id": [0] * 3 + [1] * 2,
+        "text_name": [None] * 3 + ["my text"] * 2,
+    }
+    for key, values in expected.items():
+        assert column(actual, key) == values
 
 
 def test_iter_text_to_first_relations_as_dict_ids_and_names(corpus1: Corpus) -> None:
     actual = list(corpus1.iter_text_to_first_relations_as_dict())
-    expected = [
-        [0, 0, 1, 4],
-        ["c1", "c1", "c2", "c2"],
-        [0, 0, 0, 1],
-        [None, None, None, "my text"],
-        [0, 0, 3, 7],
-        [1, 2, 4, 8],
-    ]
-    for i, (chain_id, chain_name, text_id, text_name, m1_id, m2_id) in enumerate(zip(*expected)):  # type: ignore
-        assert actual[i]["id"] == i
-        assert actual[i]["chain_id"] == chain_id
-        assert actual[i]["chain_name"] == chain_name
-        assert actual[i]["text_id"] == text_id
-        assert actual[i]["text_name"] == text_name
-        assert actual[i]["m1_id"] == m1_id
-        assert actual[i]["m2_id"] == m2_id
+    assert column(actual, "id") == list(range(len(actual)))
+    expected = {
+        "chain_id": [0, 0, 1, 4],
+        "chain_name": ["c1", "c1", "c2", "c2"],
+        "text_id": [0, 0, 0, 1],
+        "text_name": [None, None, None, "my text"],
+        "m1_id": [0, 0, 3, 7],
+        "m2_id": [1, 2, 4, 8],
+    }
+    for key, values in expected.items():
+        assert column(actual, key) == values
 
 
 def test_iter_text_consecutive_relations_as_dict_ids_and_names(corpus1: Corpus) -> None:
     actual = list(corpus1.iter_text_consecutive_relations_as_dict())
-    expected = [
-        [0, 0, 1, 4],
-        ["c1", "c1", "c2", "c2"],
-        [0, 0, 0, 1],
-        [None, None, None, "my text"],
-        [0, 1, 3, 7],
-        [1, 2, 4, 8],
-    ]
-    for i, (chain_id, chain_name, text_id, text_name, m1_id, m2_id) in enumerate(zip(*expected)):  # type: ignore
-        assert actual[i]["id"] == i
-        assert actual[i]["chain_id"] == chain_id
-        assert actual[i]["chain_name"] == chain_name
-        assert actual[i]["text_id"] == text_id
-        assert actual[i]["text_name"] == text_name
-        assert actual[i]["m1_id"] == m1_id
-        assert actual[i]["m2_id"] == m2_id
+    assert column(actual, "id") == list(range(len(actual)))
+    expected = {
+        "chain_id": [0, 0, 1, 4],
+        "chain_name": ["c1", "c1", "c2", "c2"],
+        "text_id": [0, 0, 0, 1],
+        "text_name": [None, None, None, "my text"],
+        "m1_id": [0, 1, 3, 7],
+        "m2_id": [1, 2, 4, 8],
+    }
+    for key, values in expected.items():
+        assert column(actual, key) == values
 
 
 def test_iter_tokens_as_dict_other(corpus1: Corpus) -> None:
     actual = list(corpus1.iter_tokens_as_dict())
-    expected = [
-        [
-            0,
-            2,
-            4,
-            6,
-            8,
-            10,
-            12,
-            14,
-            16,
-            18,
-            20,
-            22,
-            24,
-            0,
-            2,
-            4,
-            6,
-            8,
-            10,
-            12,
-            14,
-            16,
-            18,
-            20,
-        ],
-        [
-            1,
-            3,
-            5,
-            7,
-            9,
-            11,
-            13,
-            15,
-            17,
-            19,
-            21,
-            23,
-            25,
-            1,
-            3,
-            5,
-            7,
-            9,
-            11,
-            13,
-            15,
-            17,
-            19,
-            21,
-        ],
-        [2] * 24,
-        [
-            "ab",
-            "cd",
-            "ef",
-            "gh",
-            "ij",
-            "kl",
-            "mn",
-            "op",
-            "qr",
-            "st",
-            "uv",
-            "wx",
-            "yz",
-            "AB",
-            "CD",
-            "EF",
-            "GH",
-            "IJ",
-            "KL",
-            "MN",
-            "OP",
-            "QR",
-            "ST",
-            "UV",
-        ],
-    ]
-    for i, (start, end, length, string) in enumerate(zip(*expected)):  # type: ignore
-        assert actual[i]["start"] == start
-        assert actual[i]["end"] == end
-        assert actual[i]["length"] == length
-        assert actual[i]["string"] == string
+    # fmt: off
+    expected = {
+        "start": [0, 2, 4, 6, 8, 10, 12, 14, 16, 18, 20, 22, 24, 0, 2, 4, 6, 8, 10, 12, 14, 16, 18, 20],
+        "end": [1, 3, 5, 7, 9, 11, 13, 15, 17, 19, 21, 23, 25, 1, 3, 5, 7, 9, 11, 13, 15, 17, 19, 21],
+        "length": [2] * 24,
+        "string": ["ab", "cd", "ef", "gh", "ij", "kl", "mn", "op", "qr", "st", "uv", "wx", "yz", "AB", "CD", "EF", "GH", "IJ", "KL", "MN", "OP", "QR", "ST", "UV"],
+    }
+    # fmt: on
+    for key, values in expected.items():
+        assert column(actual, key) == values
 
 
 def test_iter_text_mentions_as_dict_other(corpus1: Corpus) -> None:
     actual = list(corpus1.iter_text_mentions_as_dict())
-    expected = [
-        [False, False, False, False, False, True, True, False, False],
-        [3, 3, 3, 2, 2, 1, 1, 2, 2],
-        [0, 6, 18, 4, 24, 12, 0, 4, 16],
-        [1, 7, 19, 5, 25, 15, 1, 7, 17],
-        [2, 2, 2, 2, 2, 4, 2, 4, 2],
-        ["ab", "gh", "st", "ef", "yz", "mn op", "AB", "EF GH", "QR"],
-    ]
-    for i, (is_singleton, chain_size, start, end, length, string) in enumerate(zip(*expected)):  # type: ignore
-        assert actual[i]["is_singleton"] == is_singleton
-        assert actual[i]["chain_size"] == chain_size
-        assert actual[i]["start"] == start
-        assert actual[i]["end"] == end
-        assert actual[i]["length"] == length
-        assert actual[i]["string"] == string
+    expected = {
+        "is_singleton": [False, False, False, False, False, True, True, False, False],
+        "chain_size": [3, 3, 3, 2, 2, 1, 1, 2, 2],
+        "start": [0, 6, 18, 4, 24, 12, 0, 4, 16],
+        "end": [1, 7, 19, 5, 25, 15, 1, 7, 17],
+        "length": [2, 2, 2, 2, 2, 4, 2, 4, 2],
+        "string": ["ab", "gh", "st", "ef", "yz", "mn op", "AB", "EF GH", "QR"],
+    }
+    for key, values in expected.items():
+        assert column(actual, key) == values
 
 
 def test_iter_text_chains_as_dict_other(corpus1: Corpus) -> None:
     actual = list(corpus1.iter_text_chains_as_dict())
-    expected = [
-        [3, 2, 1, 1, 2],
-    ]
-    for i, (size,) in enumerate(zip(*expected)):
-        assert actual[i]["size"] == size
+    expected = {
+        "size": [3, 2, 1, 1, 2],
+    }
+    for key, values in expected.items():
+        assert column(actual, key) == values
 
 
 def test_iter_text_mentions_as_dict_features(corpus1: Corpus) -> None:
@@ -517,7 +383,7 @@ def test_get_dataframes(corpus1: Corpus) -> None:
         "mention_count",
         "chain_count",
     ]
-    assert list(dfs.texts.index) == [i for i in range(2)]
+    assert dfs.texts.index.equals(pd.RangeIndex(2))
 
     assert list(dfs.paragraphs.columns) == [
         "text_id",
@@ -527,7 +393,7 @@ def test_get_dataframes(corpus1: Corpus) -> None:
         "mention_count",
         "index_of_paragraph_in_the_text",
     ]
-    assert list(dfs.paragraphs.index) == [i for i in range(6)]
+    assert dfs.paragraphs.index.equals(pd.RangeIndex(6))
 
     assert list(dfs.sentences.columns) == [
         "paragraph_id",
@@ -539,7 +405,7 @@ def test_get_dataframes(corpus1: Corpus) -> None:
         "index_of_sentence_in_the_paragraph",
         "index_of_sentence_in_the_text",
     ]
-    assert list(dfs.sentences.index) == [i for i in range(9)]
+    assert dfs.sentences.index.equals(pd.RangeIndex(9))
 
     assert list(dfs.tokens.columns) == [
         "sentence_id",
@@ -557,7 +423,7 @@ def test_get_dataframes(corpus1: Corpus) -> None:
         "index_of_token_in_the_paragraph",
         "index_of_token_in_the_text",
     ]
-    assert list(dfs.tokens.index) == [i for i in range(24)]
+    assert dfs.tokens.index.equals(pd.RangeIndex(24))
 
     assert list(dfs.text_mentions.columns) == [
         "chain_name",
@@ -587,7 +453,7 @@ def test_get_dataframes(corpus1: Corpus) -> None:
         "B",
         "C",
     ]
-    assert list(dfs.text_mentions.index) == [i for i in range(9)]
+    assert dfs.text_mentions.index.equals(pd.RangeIndex(9))
 
     assert list(dfs.text_chains.columns) == [
         "text_id",
@@ -596,7 +462,7 @@ def test_get_dataframes(corpus1: Corpus) -> None:
         "size",
         "index_of_chain_in_the_text",
     ]
-    assert list(dfs.text_chains.index) == [i for i in range(5)]
+    assert dfs.text_chains.index.equals(pd.RangeIndex(5))
 
     assert list(dfs.text_to_first_relations.columns) == [
         "chain_id",
@@ -606,7 +472,7 @@ def test_get_dataframes(corpus1: Corpus) -> None:
         "m1_id",
         "m2_id",
     ]
-    assert list(dfs.text_to_first_relations.index) == [i for i in range(4)]
+    assert dfs.text_to_first_relations.index.equals(pd.RangeIndex(4))
 
     assert list(dfs.text_consecutive_relations.columns) == [
         "chain_id",
@@ -616,18 +482,34 @@ def test_get_dataframes(corpus1: Corpus) -> None:
         "m1_id",
         "m2_id",
     ]
-    assert list(dfs.text_consecutive_relations.index) == [i for i in range(4)]
+    assert dfs.text_consecutive_relations.index.equals(pd.RangeIndex(4))
 
 
 def test_zipfile(corpus1: Corpus) -> None:
     buf = corpus1._create_csv_as_zip()
-    zf = ZipFile(buf, "r")
-    texts_csv = zf.read("texts")
-    assert texts_csv.decode() == (
-        ",name,token_count,sentence_count,paragraph_count,mention_count,chain_count\n"
-        "0,,13,6,4,6,3\n"
-        "1,my text,11,3,2,3,2\n"
-    )
+    with ZipFile(buf, "r") as zf, zf.open("texts") as fh:
+        assert fh.read() == (
+            b",name,token_count,sentence_count,paragraph_count,mention_count,chain_count\n"
+            b"0,,13,6,4,6,3\n"
+            b"1,my text,11,3,2,3,2\n"
+        )
+
+
+def test_save_csv_as_zip(corpus1: Corpus, tmp_path: Path) -> None:
+    file = tmp_path / "corpus.zip"
+    corpus1.save_csv_as_zip(file)
+    with ZipFile(file, "r") as zf, ZipFile(corpus1._create_csv_as_zip()) as expected:
+        assert zf.namelist() == [
+            "texts",
+            "paragraphs",
+            "sentences",
+            "tokens",
+            "text_mentions",
+            "text_chains",
+            "text_to_first_relations",
+            "text_consecutive_relations",
+        ]
+        assert zf.read("texts") == expected.read("texts")
 
 
 def test_text_metadata__no_metadata() -> None:
@@ -656,7 +538,7 @@ def test_text_metadata__no_metadata() -> None:
 def test_text_metadata__1_text_with_metadata() -> None:
     corpus = Corpus(
         _texts=[
-            Text(metadata=dict(a="1", b=2)),
+            Text(metadata={"a": "1", "b": 2}),
             Text(),
             Text(),
         ]
@@ -682,9 +564,9 @@ def test_text_metadata__1_text_with_metadata() -> None:
 def test_text_metadata__2_texts_with_metadata() -> None:
     corpus = Corpus(
         _texts=[
-            Text(metadata=dict(a="1", b=2)),
+            Text(metadata={"a": "1", "b": 2}),
             Text(),
-            Text(metadata=dict(A="3", B=4)),
+            Text(metadata={"A": "3", "B": 4}),
         ]
     )
     texts = list(corpus.iter_texts_as_dict())
@@ -719,9 +601,10 @@ def test_empty_dataset() -> None:
         corpus.get_dataframes()
 
 
+@pytest.mark.mutates_corpus
 def test_text_metadata_in_dataframe__2_texts_with_metadata(corpus1: Corpus) -> None:
-    corpus1._texts[0].metadata = dict(a="1", b=2)
-    corpus1._texts[1].metadata = dict(A="3", B=4)
+    corpus1._texts[0].metadata = {"a": "1", "b": 2}
+    corpus1._texts[1].metadata = {"A": "3", "B": 4}
     dfs = corpus1.get_dataframes()
     assert list(dfs.texts.columns) == [
         "name",
@@ -735,3 +618,98 @@ def test_text_metadata_in_dataframe__2_texts_with_metadata(corpus1: Corpus) -> N
         "A",
         "B",
     ]
+
+
+@pytest.mark.mutates_corpus
+def test_chains_cache_is_refreshed_when_mentions_are_added(corpus1: Corpus) -> None:
+    text = corpus1._texts[0]
+    assert text.chain_count == 3
+    assert text._paragraphs[1].chain_count == 0
+    text._paragraphs[1]._sentences[0].add_mention(
+        Mention("c4", "ij", list(text._paragraphs[1]._sentences[0].tokens)[:1])
+    )
+    assert text.chain_count == 4
+    assert text._paragraphs[1].chain_count == 1
+    assert [chain.name for chain in text.chains] == ["c1", "c2", "c4", "c3"]
+
+
+@pytest.mark.mutates_corpus
+def test_get_dataframes_matches_iter_as_dict(corpus1: Corpus) -> None:
+    # a feature with the name of a column overrides it for this mention only
+    corpus1._texts[0]._paragraphs[0]._sentences[0]._mentions[0]["start"] = "x"
+    dfs = corpus1.get_dataframes()
+    for actual, dicts in [
+        (dfs.tokens, corpus1.iter_tokens_as_dict()),
+        (dfs.text_mentions, corpus1.iter_text_mentions_as_dict()),
+    ]:
+        expected = pd.DataFrame(list(dicts)).set_index("id")
+        pd.testing.assert_frame_equal(
+            actual, expected, check_names=False, check_index_type=False
+        )
+
+
+def test_chain_counts(corpus1: Corpus) -> None:
+    assert corpus1.text_chain_count == 5
+    assert corpus1.paragraph_chain_count == 8
+    assert corpus1.sentence_chain_count == 9
+    assert corpus1._texts[0].paragraph_chain_count == 5
+    assert corpus1._texts[0].sentence_chain_count == 6
+    assert corpus1._texts[0]._paragraphs[0].sentence_chain_count == 3
+
+
+@pytest.mark.mutates_corpus
+def test_counts_cache_is_refreshed_when_elements_are_added(corpus1: Corpus) -> None:
+    assert corpus1.token_count == 24
+    assert corpus1.sentence_count == 9
+    assert corpus1.mention_count == 9
+    sentence = Sentence()
+    corpus1._texts[1]._paragraphs[1].add_sentence(sentence)
+    sentence.add_token(Token(22, 23, "WX"))
+    sentence.add_mention(Mention("c1", "WX", [Token(22, 23, "WX")]))
+    assert corpus1.token_count == 25
+    assert corpus1.sentence_count == 10
+    assert corpus1.mention_count == 10
+    assert corpus1._texts[1].token_count == 12
+
+
+@pytest.mark.mutates_corpus
+def test_chains_cache_is_refreshed_when_a_mention_is_changed(corpus1: Corpus) -> None:
+    text = corpus1._texts[0]
+    assert [chain.name for chain in text.chains] == ["c1", "c2", "c3"]
+    mention = text._paragraphs[2]._sentences[0]._mentions[0]
+    mention.chain_name = "c1"
+    assert [chain.name for chain in text.chains] == ["c1", "c2"]
+    assert [chain.mention_count for chain in text.chains] == [4, 2]
+    assert text.chain_count == 2
+    assert corpus1.text_chain_count == 4
+
+
+def test_cache_is_not_pickled(corpus1: Corpus) -> None:
+    text = corpus1._texts[0]
+    assert text.chain_count == 3
+    assert text._cache
+    copied = pickle.loads(pickle.dumps(text))
+    assert copied._cache == {}
+    assert copied == text
+    assert copied.chain_count == 3
+    # the children of the copy belong to the copy, not to the corpus
+    assert copied._parent is None
+    assert all(paragraph._parent is copied for paragraph in copied.paragraphs)
+    copied._paragraphs[1]._sentences[0].add_mention(Mention("c4", "ij"))
+    assert copied.chain_count == 4
+    assert text.chain_count == 3
+
+
+@pytest.mark.mutates_corpus
+def test_cache_is_kept_when_another_container_is_changed(corpus1: Corpus) -> None:
+    first, second = corpus1.texts
+    assert corpus1.text_chain_count == 5
+    assert first.chain_count == 3
+    assert second.chain_count == 2
+    second._paragraphs[0].add_sentence(Sentence())
+    mention = first._paragraphs[0]._sentences[0]._mentions[0]
+    mention.string += "x"
+    mention["feature"] = "value"
+    assert "chains" in first._cache
+    assert "chains" not in second._cache
+    assert corpus1._cache == {}
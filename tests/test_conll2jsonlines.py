@@ -0,0 +1,56 @@
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import conll2jsonlines
+
+TESTING_DIR = Path(__file__).parent.parent / "testing"
+
+
+class RecordingFile(io.RawIOBase):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes: list[bytes] = []
+
+    def write(self, data: Any) -> int:
+        self.writes.append(bytes(data))
+        return len(data)
+
+
+def convert(infpath: Path, monkeypatch: pytest.MonkeyPatch) -> list[bytes]:
+    fh = RecordingFile()
+    monkeypatch.setattr(conll2jsonlines, "open", lambda *args, **kwargs: fh, raising=False)
+    conll2jsonlines.conll2jsonlines(
+        infpath,
+        infpath.with_suffix(".jsonlines"),
+        sep="\t",
+        ignore_double_indices=0,
+        token_col=1,
+        speaker_col="_",
+        par_col=11,
+    )
+    return fh.writes
+
+
+def test_buffer_is_flushed_with_paragraphs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    doc = (TESTING_DIR / "singe.conll").read_text()
+    infpath = tmp_path / "docs.conll"
+    infpath.write_text(
+        "\n".join(doc.replace("articleswiki_singe", "doc%d" % i) for i in range(3))
+    )
+    (output,) = convert(infpath, monkeypatch)
+    lines = output.splitlines()
+    assert [json.loads(line)["doc_key"] for line in lines] == [
+        "(ge/doc%d.xml); part 000" % i for i in range(3)
+    ]
+
+    # flush once two documents are waiting
+    monkeypatch.setattr(conll2jsonlines, "FLUSH_SIZE", len(lines[0]) * 3 // 2)
+    writes = convert(infpath, monkeypatch)
+    assert [data.count(b"\n") for data in writes] == [2, 1]
+    assert b"".join(writes) == output
@@ -0,0 +1,21 @@
+from pathlib import Path
+
+import pandas as pd  # type: ignore
+
+from sacr2df import PARALLEL_MIN_FILE_COUNT, convert_sacr_files_to_dataframes
+
+TESTING_DIR = Path(__file__).parent.parent / "testing"
+
+
+def test_convert_sacr_files_in_worker_processes() -> None:
+    files = [
+        TESTING_DIR / "aesop.sacr",
+        TESTING_DIR / "caesar.sacr",
+        TESTING_DIR / "cicero.sacr",
+        TESTING_DIR / "pliny.sacr",
+    ]
+    assert len(files) >= PARALLEL_MIN_FILE_COUNT
+    expected = convert_sacr_files_to_dataframes(*files)
+    actual = convert_sacr_files_to_dataframes(*files, workers=2)
+    for name in vars(expected):
+        pd.testing.assert_frame_equal(getattr(actual, name), getattr(expected, name))
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 import pytest
 
 from sacr_parser2 import (
@@ -10,6 +12,7 @@ from sacr_parser2 import (
     TextID,
     Token,
     Word,
+    read_file,
 )
 
 text1 = """#textid:abc-123
@@ -136,3 +139,19 @@ def test_parse_texts(text: str, tokens: list[Token]) -> None:
     assert len(actual_tokens) == len(tokens)
     for a_t, t in zip(actual_tokens, tokens):
         assert a_t == t
+
+
+def test_tokens_of_different_types_are_different() -> None:
+    assert ParagraphStart(start=3, end=3) == ParagraphStart(start=3, end=3)
+    assert ParagraphStart(start=3, end=3) != ParagraphEnd(start=3, end=3)
+    assert Word(start=0, end=1, value=" ") != Spaces(start=0, end=1, value=" ")
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"", text1.encode(), b"abc\r\ndef\rghi\n\r\n"],
+)
+def test_read_file(tmp_path: Path, data: bytes) -> None:
+    path = tmp_path / "text.sacr"
+    path.write_bytes(data)
+    assert read_file(path) == path.read_text()
@@ -35,30 +35,44 @@ Notes:
 
 
 import argparse
-import json
+import functools
 import re
+import sys
 
 import stanfordnlp
 from stanfordnlp.models.common.conll import CoNLLFile
 
+# same serialization settings as conll2jsonlines
+from conll2jsonlines import dumps
+
 # download French models:
 #stanfordnlp.download('fr')
 
+# each line is a paragraph
+PARAGRAPH_SEP_PATTERN = re.compile(r'\n+')
+
+
+@functools.lru_cache(maxsize=None)
+def get_pipeline(lang):
+    """Load the models for `lang` once, they are slow to load."""
+    return stanfordnlp.Pipeline(lang=lang, processors="tokenize,mwt,pos")
+
 
 def tokenize(fpath, lang):
 
-    content = open(fpath).read()
-    paragraphs = re.split(r'\n+', content)
+    with open(fpath) as fh:
+        content = fh.read()
+    paragraphs = PARAGRAPH_SEP_PATTERN.split(content)
     res_sents = []
     res_pars = []
     res_pos = []
     start_par = 0
+    nlp = get_pipeline(lang)
     for par in paragraphs:
-        par = par.strip()
-        if not par:
+        if not par or par.isspace():
             continue
+        par = par.strip()
         doc = stanfordnlp.Document(par)
-        nlp = stanfordnlp.Pipeline(lang=lang, processors="tokenize,mwt,pos")
         doc = nlp(doc)
         #print(doc.conll_file.conll_as_string())
         #print(doc.conll_file.sents)
@@ -72,33 +86,43 @@ def tokenize(fpath, lang):
         ]
         res_sents.extend(sents)
         res_pos.extend(pos)
-        length = sum((len(s) for s in sents))
+        length = sum(map(len, sents))
         res_pars.append([start_par, start_par+length-1])
         start_par = start_par+length
     return res_sents, res_pos, res_pars
 
 
-def make_jsonlines(sents, pos, pars, fpath, genre):
-    doc = dict(
+def make_doc(sents, pos, pars, fpath, genre):
+    return dict(
         doc_key = f"{genre[:2]}:{fpath}",
         sentences = sents,
-        speakers = [ [ "_" for tok in sent ] for sent in sents ],
+        speakers = [ [ "_" ] * len(sent) for sent in sents ],
         clusters = [],
         pos = pos,
         paragraphs = pars,
     )
-    return json.dumps(doc)
+
+
+def make_jsonlines(sents, pos, pars, fpath, genre):
+    return dumps(make_doc(sents, pos, pars, fpath, genre)).decode('utf-8')
+
+
+def write_jsonlines(fh, sents, pos, pars, fpath, genre):
+    """Same as `make_jsonlines`, but write the line to the binary file `fh`,
+    without decoding it."""
+    fh.write(dumps(make_doc(sents, pos, pars, fpath, genre)))
+    fh.write(b"\n")
 
 
 
 def make_conll(sents, fpath, genre):
-    res = f"#begin document {genre[:2]}:{fpath}\n"
+    parts = [f"#begin document {genre[:2]}:{fpath}\n"]
     for sent in sents:
         for i, token in enumerate(sent):
-            res += f"{i+1}\t{token}\n"
-        res += "\n"
-    res += "#end document"
-    return res
+            parts.append(f"{i+1}\t{token}\n")
+        parts.append("\n")
+    parts.append("#end document")
+    return "".join(parts)
 
 
 
@@ -130,13 +154,21 @@ def main():
     sents, pos, pars = tokenize(args.infpath, lang=args.lang)
     if args.export_conll:
         code = make_conll(sents, fpath=args.infpath, genre=args.genre)
+        if args.outfpath:
+            with open(args.outfpath, 'w') as fh:
+                fh.write(code + "\n")
+        else:
+            print(code)
+    elif args.outfpath:
+        with open(args.outfpath, 'wb', buffering=1<<20) as fh:
+            write_jsonlines(fh, sents, pos, pars,
+                fpath=args.infpath, genre=args.genre)
     else:
-        code = make_jsonlines(sents, pos, pars,
+        # the json is written as utf-8 bytes, after what is already printed
+        sys.stdout.flush()
+        write_jsonlines(sys.stdout.buffer, sents, pos, pars,
             fpath=args.infpath, genre=args.genre)
-    if args.outfpath:
-        open(args.outfpath, 'w').write(code + "\n")
-    else:
-        print(code)
+        sys.stdout.buffer.flush()
 
 
 